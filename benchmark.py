@@ -0,0 +1,130 @@
+import os
+import json
+import logging
+import argparse
+import tempfile
+import itertools
+from time import perf_counter, thread_time
+from ipaddress import ip_interface
+# Import custom aggregate class and local IxNetwork stand-in
+from src.ixnetwork_aggregate import IxNetworkRESTAPI
+from src.stub_server import IxNetworkStubServer
+from src.certificate_cache import CertificateCache
+
+
+class StageMeter():
+    '''
+    Simple helper, that measures wall time, client CPU time and number
+    of requests (seen by the stub server) of each benchmark stage.
+    CPU time is measured for the calling thread only, so the in-process
+    stub server doesn't affect it.
+    '''
+    def __init__(self, server):
+        self.server = server
+        self.stages = {}
+
+    def run(self, name, function, *args, **kwargs):
+        requests_before = self.server.request_count
+        wall, cpu = perf_counter(), thread_time()
+        result = function(*args, **kwargs)
+        self.stages[name] = {
+            'wall_time': perf_counter() - wall,
+            'cpu_time': thread_time() - cpu,
+            'requests': self.server.request_count - requests_before}
+        return result
+
+
+def build_ports(port_count: int) -> dict:
+    '''
+    The function returns ports dictionary (see demo.py) for port_count ports
+    '''
+    return {
+        f'port1/{index}': {
+            'card': '1',
+            'port': str(index),
+            'link_id': 'left_side' if index % 2 else 'right_side'}
+        for index in range(1, port_count + 1)}
+
+
+def run_scenario(port_count, multiplier, rtt, duration, bulk, backend, directory):
+    '''
+    The function runs the demo.py workflow against the fresh stub server
+    and returns measurements of all stages
+    '''
+    with IxNetworkStubServer(latency=rtt) as server:
+        meter = StageMeter(server)
+        session = meter.run(
+            'make_rest_session', IxNetworkRESTAPI,
+            '127.0.0.1', server.port, 'username', 'password', backend=backend,
+            # Each stub server has its own certificate
+            certificate_cache=CertificateCache(path=None))
+        storage = session.storage
+        meter.run('assign_ports', session.assign_ports,
+                  '192.168.100.1', build_ports(port_count), storage)
+        meter.run('create_topology', session.create_topology, storage, bulk=bulk)
+        meter.run('create_device_groups', session.create_device_groups,
+                  storage, multiplier=multiplier, bulk=bulk)
+        meter.run('create_ethernet', session.create_ethernet, storage, bulk=bulk)
+        meter.run('create_ipv4', session.create_ipv4, storage, bulk=bulk)
+        addressing_scheme = [
+            (
+                ip_interface(f'10.{index // 250}.{index % 250}.20/24'),
+                ip_interface(f'10.{index // 250}.{index % 250}.10/24'))
+            for index in range(port_count)]
+        meter.run('change_ipv4_address', session.change_ipv4_address,
+                  storage, addressing_scheme)
+        if backend == 'importconfig':
+            meter.run('push_config', session.push_config)
+        meter.run('create_traffic_item', session.create_traffic_item,
+                  hrefs=storage.ipv4[:2])
+        meter.run('traffic_item_macros', session.traffic_item_macros, duration=duration)
+        meter.run('save_and_download_config', session.save_and_download_config,
+                  os.path.join(directory, 'benchmark.ixncfg'))
+        session.close_rest_session()
+    return {
+        'parameters': {
+            'ports': port_count,
+            'multiplier': multiplier,
+            'rtt': rtt,
+            'duration': duration,
+            'bulk': bulk,
+            'backend': backend},
+        'stages': meter.stages,
+        'total': {
+            key: sum(stage[key] for stage in meter.stages.values())
+            for key in ['wall_time', 'cpu_time', 'requests']}}
+
+
+# Benchmark of scenario build time vs. scale
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark of demo.py workflow against local IxNetwork stub')
+    parser.add_argument('--ports', type=int, nargs='+', default=[2, 8, 32])
+    parser.add_argument('--multipliers', type=int, nargs='+', default=[1, 100])
+    parser.add_argument('--rtt', type=float, nargs='+', default=[0.0, 0.005],
+                        help='injected latency of each request, seconds')
+    parser.add_argument('--duration', type=float, default=1.0,
+                        help='traffic duration, seconds')
+    parser.add_argument('--bulk', action='store_true', help='use bulk list POSTs')
+    parser.add_argument('--backend', default='rest', choices=IxNetworkRESTAPI.BACKENDS)
+    parser.add_argument('--output', default='benchmark.json')
+    arguments = parser.parse_args()
+    logging.basicConfig(
+        level=logging.WARNING,
+        datefmt='%Y-%m-%d %H:%M:%S',
+        format='%(asctime)s %(levelname)12s %(message)s')
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for port_count, multiplier, rtt in itertools.product(
+                arguments.ports, arguments.multipliers, arguments.rtt):
+            result = run_scenario(
+                port_count, multiplier, rtt, arguments.duration,
+                arguments.bulk, arguments.backend, directory)
+            results.append(result)
+            logging.warning(
+                f'ports={port_count} multiplier={multiplier} rtt={rtt}: '
+                f'{result["total"]["wall_time"]:.3f} s, '
+                f'{result["total"]["requests"]} requests, '
+                f'{result["total"]["cpu_time"]:.3f} s CPU')
+    with open(arguments.output, 'w', encoding='utf-8') as output_file:
+        json.dump(results, output_file, indent=4)
@@ -0,0 +1,192 @@
+import json
+import asyncio
+from functools import partial
+from src.session_abc import IxNetworkSession
+
+
+class AsyncNetworkObjectsMixin(IxNetworkSession):
+    '''
+    This is a mixin class. It only contains specific methods
+    and can't be instantiate (due to inheritance from ABC class).
+
+    This class contains coroutine counterparts of MainObjectsMixin and
+    CoreNetworkObjectsMixin methods. Independent sibling objects (e.g.
+    DeviceGroups of different topologies) are created concurrently,
+    while the number of requests in flight is limited by max_in_flight.
+
+    Blocking requests.Session calls are executed in the thread pool
+    provided by concrete class as self.executor.
+    '''
+
+    def in_flight_semaphore(self):
+        '''
+        The method returns semaphore, that limits concurrent requests.
+        Semaphore is bound to the running event loop, so it is recreated
+        if the methods are invoked from another asyncio.run() call.
+        '''
+        loop = asyncio.get_running_loop()
+        bound_loop, semaphore = getattr(
+            self, '_in_flight_semaphore', (None, None))
+        if bound_loop is not loop:
+            semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._in_flight_semaphore = (loop, semaphore)
+        return semaphore
+
+    async def request(self, method: str, url: str, data=None):
+        '''
+        The method sends single request through the blocking session
+        in the executor thread and logs the result.
+        '''
+        async with self.in_flight_semaphore():
+            response = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                partial(self.session.request, method, url, data=data))
+        self.logger(response)
+        return response
+
+    async def create_children(
+            self,
+            parent_hrefs,
+            child: str,
+            payloads,
+            bulk: bool=False):
+        '''
+        The method concurrently posts one payload into the "child"
+        collection of each provided parent and returns response texts
+        in the same order as the parents.
+
+        In bulk mode payloads are grouped by parent collection and each
+        collection gets one list POST (collections are still concurrent).
+        '''
+        if bulk:
+            collections = {}
+            for parent_href, payload in zip(parent_hrefs, payloads):
+                collections.setdefault(parent_href, []).append(payload)
+            parent_hrefs = list(collections)
+            payloads = list(collections.values())
+        else:
+            payloads = [[payload] for payload in payloads]
+        responses = await asyncio.gather(*[
+            self.request(
+                'POST',
+                ''.join([self.entry_point, parent_href, child]),
+                data=json.dumps(payload))
+            for parent_href, payload in zip(parent_hrefs, payloads)])
+        return [response.text for response in responses]
+
+    async def create_topology(
+            self,
+            storage,
+            existed_vports=None,
+            bulk: bool=False):
+        '''
+        The method creates IxNetowrk topologies based on previously
+        created ports (one topology per port, all of them concurrently)
+        '''
+        if not existed_vports:
+            existed_vports = storage.vports
+        storage.topologies = await self.create_children(
+            [self.api_root] * len(existed_vports),
+            '/topology',
+            [{'ports': [port_href]} for port_href in existed_vports],
+            bulk=bulk)
+
+    async def create_device_groups(
+            self,
+            storage,
+            existed_topologies=None,
+            multiplier: int=1,
+            bulk: bool=False):
+        '''
+        The method concurrently creates DeviceGroups based on previously
+        created topologies
+        '''
+        if not existed_topologies:
+            existed_topologies = storage.topologies
+        storage.device_groups = await self.create_children(
+            existed_topologies,
+            '/deviceGroup',
+            [
+                {'multiplier': multiplier, 'name': topology_href[-1]}
+                for topology_href in existed_topologies
+            ],
+            bulk=bulk)
+
+    async def create_ethernet(
+            self,
+            storage,
+            existed_device_groups=None,
+            bulk: bool=False):
+        '''
+        The method concurrently creates Ethernet instances for provided
+        DeviceGroups
+        '''
+        if not existed_device_groups:
+            existed_device_groups = storage.device_groups
+        storage.ethernets = await self.create_children(
+            existed_device_groups,
+            '/ethernet',
+            [{}] * len(existed_device_groups),
+            bulk=bulk)
+
+    async def create_ipv4(
+            self,
+            storage,
+            existed_ethernets=None,
+            bulk: bool=False):
+        '''
+        The method concurrently creates IPv4 instances for provided
+        Ethernets
+        '''
+        if not existed_ethernets:
+            existed_ethernets = storage.ethernets
+        storage.ipv4 = await self.create_children(
+            existed_ethernets,
+            '/ipv4',
+            [{}] * len(existed_ethernets),
+            bulk=bulk)
+
+    async def change_ipv4_address(self, storage, addresses: list):
+        '''
+        The method changes address, prefix and gateway of the IPv4
+        objects. Each IPv4 object is handled concurrently and its three
+        multivalues are changed concurrently too.
+        '''
+        await asyncio.gather(*[
+            self.change_single_ipv4_address(ipv4_href, pair)
+            for ipv4_href, pair in zip(storage.ipv4, addresses)])
+
+    async def change_single_ipv4_address(self, ipv4_href: str, pair):
+        '''
+        The method is a coroutine part of change_ipv4_address() for the
+        one IPv4 object and one (address, gateway) pair
+        '''
+        # Get searching hrefs (from the attribute cache if possible)
+        attributes = ['address', 'prefix', 'gatewayIp']
+        hrefs_dictionary = self.attribute_cache.get(ipv4_href, attributes)
+        if hrefs_dictionary is None:
+            response = await self.request(
+                'GET', ''.join([self.entry_point, ipv4_href]))
+            hrefs_dictionary = {
+                name: response.json()[name] for name in attributes}
+            self.attribute_cache.put(ipv4_href, hrefs_dictionary)
+        await asyncio.gather(
+            # Set address
+            self.request(
+                'POST',
+                ''.join([
+                    self.entry_point, hrefs_dictionary['address'], '/singleValue']),
+                data=json.dumps([{'value': str(pair[0].ip)}])),
+            # Set network mask
+            self.request(
+                'PATCH',
+                ''.join([
+                    self.entry_point, hrefs_dictionary['prefix'], '/singleValue']),
+                data=json.dumps(
+                    {'value': str(pair[1].with_prefixlen.split('/')[1])})),
+            # Set gateway
+            self.request(
+                'POST',
+                ''.join([
+                    self.entry_point, hrefs_dictionary['gatewayIp'], '/singleValue']),
+                data=json.dumps([{'value': str(pair[1].ip)}])))
@@ -0,0 +1,56 @@
+import threading
+from collections import OrderedDict
+
+
+class AttributeCache():
+    '''
+    This is a concrete class that caches structural attributes of
+    IxNetwork objects (like multivalue hrefs of IPv4 address, prefix and
+    gateway), which never change during the object life.
+
+    Least recently used objects are evicted, when there are more
+    than "maxsize" objects in the cache.
+    '''
+
+    def __init__(self, maxsize: int=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, href: str, attributes=()):
+        '''
+        The method returns cached attributes dictionary of the object
+        or None, if object (or any of requested attributes) is not cached
+        '''
+        with self._lock:
+            entry = self._entries.get(href)
+            if entry is None or any(name not in entry for name in attributes):
+                return None
+            self._entries.move_to_end(href)
+            return entry
+
+    def put(self, href: str, attributes: dict):
+        with self._lock:
+            entry = self._entries.setdefault(href, {})
+            entry.update(attributes)
+            self._entries.move_to_end(href)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, href: str):
+        '''
+        The method drops cached object and all its children
+        '''
+        prefix = href + '/'
+        with self._lock:
+            for cached_href in [
+                    cached_href for cached_href in self._entries
+                    if cached_href == href or cached_href.startswith(prefix)]:
+                del self._entries[cached_href]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,36 @@
+import json
+from src.session_abc import IxNetworkSession
+
+
+class BulkRequestsMixin(IxNetworkSession):
+    '''
+    This is a mixin class. It only contains specific methods
+    and can't be instantiate (due to inheritance from ABC class).
+
+    This class contains helper methods for bulk (list) POST requests.
+    IxNetwork REST API accepts a JSON array of objects in one POST, so all
+    children of the same parent collection can be created by one request.
+    '''
+
+    def bulk_create(self, parent_hrefs, child: str, payloads):
+        '''
+        The method groups provided payloads by their parent collection
+        ("parent href" + "child") and sends one list POST per collection.
+
+        It returns list of response texts, suitable for Storage. Hrefs in
+        responses are ordered by collection (in order of first appearance)
+        and then by payload order, i.e. they have the same order as
+        provided parents if every parent is mentioned once.
+        '''
+        collections = {}
+        for parent_href, payload in zip(parent_hrefs, payloads):
+            collections.setdefault(
+                ''.join([parent_href, child]), []).append(payload)
+        cummulative_hrefs = []
+        for collection_href, collection_payloads in collections.items():
+            response = self.session.post(
+                url=''.join([self.entry_point, collection_href]),
+                data=json.dumps(collection_payloads))
+            cummulative_hrefs.append(response.text)
+            self.logger(response)
+        return cummulative_hrefs
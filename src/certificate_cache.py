@@ -0,0 +1,125 @@
+import os
+import ssl
+import json
+import hashlib
+import tempfile
+import threading
+from requests.adapters import HTTPAdapter
+
+
+class CertificateCache():
+    '''
+    This is a concrete class that keeps self-signed certificates of
+    IxNetwork hosts on disk, so they are fetched over TLS only once.
+
+    Entries are keyed by "host:port" and contain PEM certificate with its
+    SHA-256 fingerprint. Connections are verified by pinning of this
+    fingerprint (see PinnedAdapter), so neither trusted CA bundle nor
+    /etc/hosts entry for the certificate hostname is required.
+
+    If path is None, certificates are cached only in memory. If IxNetwork
+    certificate is regenerated, its entry should be removed with forget().
+    '''
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.ixnetwork', 'certificates.json')
+
+    def __init__(self, path: str=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = None
+
+    @staticmethod
+    def key(host: str, port) -> str:
+        return f'{host}:{port}'
+
+    def load(self) -> dict:
+        '''
+        The method returns all entries {host:port: entry} from the cache file
+        '''
+        if self.path is None or not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as cache_file:
+            return json.load(cache_file)
+
+    def save(self, removed: tuple=()):
+        '''
+        The method atomically replaces the cache file. Entries written
+        meanwhile by other processes are kept, unless they are "removed".
+        '''
+        if self.path is None:
+            return
+        entries = self.load()
+        entries.update(self._entries)
+        for key in removed:
+            entries.pop(key, None)
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', dir=directory, delete=False) as cache_file:
+            json.dump(entries, cache_file, indent=4)
+        os.replace(cache_file.name, self.path)
+
+    def get(self, host: str, port) -> dict:
+        '''
+        The method returns cached entry {'certificate': PEM, 'fingerprint':
+        SHA-256 hex digest} for the host or None
+        '''
+        with self._lock:
+            if self._entries is None:
+                self._entries = self.load()
+            return self._entries.get(self.key(host, port))
+
+    def fetch(self, host: str, port) -> dict:
+        '''
+        The method gets certificate from the host over TLS and caches it
+        '''
+        certificate = ssl.get_server_certificate((host, int(port)))
+        entry = {
+            'certificate': certificate,
+            'fingerprint': hashlib.sha256(
+                ssl.PEM_cert_to_DER_cert(certificate)).hexdigest()}
+        with self._lock:
+            if self._entries is None:
+                self._entries = self.load()
+            self._entries[self.key(host, port)] = entry
+            self.save()
+        return entry
+
+    def fingerprint(self, host: str, port) -> str:
+        '''
+        The method returns SHA-256 fingerprint of the host certificate,
+        the certificate is fetched only if it isn't cached yet
+        '''
+        entry = self.get(host, port) or self.fetch(host, port)
+        return entry['fingerprint']
+
+    def forget(self, host: str, port):
+        '''
+        The method removes entry of the host from the cache
+        '''
+        with self._lock:
+            if self._entries is None:
+                self._entries = self.load()
+            self._entries.pop(self.key(host, port), None)
+            self.save(removed=(self.key(host, port),))
+
+
+class PinnedAdapter(HTTPAdapter):
+    '''
+    This is a transport adapter, that accepts only the certificate with
+    provided SHA-256 fingerprint. The certificate isn't checked against
+    CA bundle and its hostname (IxNetwork certificate is issued to
+    IxNetwork-Self-Host), so there is no need in /etc/hosts workarounds.
+    If fingerprint is None, it is an ordinary HTTPAdapter.
+    '''
+
+    def __init__(self, fingerprint: str=None, **kwargs):
+        self.fingerprint = fingerprint
+        super().__init__(**kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        if self.fingerprint is None or not url.lower().startswith('https'):
+            return super().cert_verify(conn, url, verify, cert)
+        super().cert_verify(conn, url, False, cert)
+        # New connections of the pool check the fingerprint
+        conn.assert_fingerprint = self.fingerprint
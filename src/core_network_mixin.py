@@ -1,8 +1,10 @@
 import json
-from src.session_abc import IxNetworkSession
+from src.bulk_requests_mixin import BulkRequestsMixin
+from src.select_query_mixin import SelectQueryMixin
+from src.instrumentation import traced
 
 
-class CoreNetworkObjectsMixin(IxNetworkSession):
+class CoreNetworkObjectsMixin(BulkRequestsMixin, SelectQueryMixin):
     '''
     This is a mixin class. It only contains specific methods
     and can't be instantiate (due to inheritance from ABC class).
@@ -11,67 +13,89 @@ class CoreNetworkObjectsMixin(IxNetworkSession):
     Ethernet, IPv4 and IPv6 instances inside DeviceGroups.
     '''
 
-    def create_ethernet(self, storage, existed_device_groups=None):
+    @traced
+    def create_ethernet(
+            self,
+            storage,
+            existed_device_groups=None,
+            bulk: bool=False):
         '''
         The method creates Ethernet instances for provided DeviceGroups
+
+        In bulk mode Ethernets are grouped by DeviceGroup and created by
+        one list POST request per DeviceGroup.
         '''
         if not existed_device_groups:
             existed_device_groups = storage.device_groups
+        if bulk:
+            storage.ethernets = self.bulk_create(
+                existed_device_groups,
+                '/ethernet',
+                [{}] * len(existed_device_groups))
+            return
         cummulative_hrefs = []
         # Currently we just send empty JSON
         ethernet_properties_dict_json = json.dumps([{}])
         # For each DeviceGroup within each topology
         for device_group_href in existed_device_groups:
-            self.response = self.session.post(
+            response = self.session.post(
                 url=''.join([
                     self.entry_point,
                     device_group_href,
                     '/ethernet']),
                 data=ethernet_properties_dict_json)
-            cummulative_hrefs.append(self.response.text)
-            self.logger()
+            cummulative_hrefs.append(response.text)
+            self.logger(response)
         # Save Ethernets hrefs for future usage
         storage.ethernets = cummulative_hrefs
 
+    @traced
     def create_ipv4(
             self,
             storage,
-            existed_ethernets=None):
+            existed_ethernets=None,
+            bulk: bool=False):
         '''
         The method is very similar to create_ethernet()
         '''
         if not existed_ethernets:
             existed_ethernets = storage.ethernets
+        if bulk:
+            storage.ipv4 = self.bulk_create(
+                existed_ethernets,
+                '/ipv4',
+                [{}] * len(existed_ethernets))
+            return
         cummulative_hrefs = []
         # Currently we just send empty JSON
         ipv4_properties_dict_json = json.dumps([{}])
         # For each provided Ethernet object
         for ethernet_href in existed_ethernets:
-            self.response = self.session.post(
+            response = self.session.post(
                 url=''.join([
                     self.entry_point,
                     ethernet_href,
                     '/ipv4']),
                 data=ipv4_properties_dict_json)
-            cummulative_hrefs.append(self.response.text)
-            self.logger()
+            cummulative_hrefs.append(response.text)
+            self.logger(response)
         # Save IPv4 hrefs for future usage
         storage.ipv4 = cummulative_hrefs
 
+    @traced
     def change_ipv4_address(self, storage, addresses: list):
         '''
         The method gets hrefs for IPv4 address, prefix and gateway from
         IPv4 IxNetwork object and then changes them according to provided
         arguments.
+
+        Hrefs are taken from the attribute cache, so repeated changes
+        of the same objects don't need any reads.
         '''
-        for index, pair in enumerate(addresses):
-            # Get searching hrefs
-            self.response = self.session.get(
-                url=''.join([
-                    self.entry_point,
-                    storage.ipv4[index]]))
-            self.logger()
-            hrefs_dictionary = self.response.json()
+        # Get searching hrefs
+        multivalues = self.get_attributes(
+            storage.ipv4[:len(addresses)], ['address', 'prefix', 'gatewayIp'])
+        for hrefs_dictionary, pair in zip(multivalues, addresses):
             # Set address
             ipv4_dict_json = json.dumps(
                 [
@@ -79,25 +103,25 @@ class CoreNetworkObjectsMixin(IxNetworkSession):
                         'value': str(pair[0].ip)
                     }
                 ])
-            self.response = self.session.post(
+            response = self.session.post(
                 url=''.join([
                     self.entry_point,
                     hrefs_dictionary['address'],
                     '/singleValue']),
                 data=ipv4_dict_json)
-            self.logger()
+            self.logger(response)
             # Set network mask
             prefix_dict_json = json.dumps(
                 {
                     'value': str(pair[1].with_prefixlen.split('/')[1])
                 })
-            self.response = self.session.patch(
+            response = self.session.patch(
                 url=''.join([
                     self.entry_point,
                     hrefs_dictionary['prefix'],
                     '/singleValue']),
                 data=prefix_dict_json)
-            self.logger()
+            self.logger(response)
             # Set gateway
             gateway_dict_json = json.dumps(
                 [
@@ -105,10 +129,106 @@ class CoreNetworkObjectsMixin(IxNetworkSession):
                         'value': str(pair[1].ip)
                     }
                 ])
-            self.response = self.session.post(
+            response = self.session.post(
                 url=''.join([
                     self.entry_point,
                     hrefs_dictionary['gatewayIp'],
                     '/singleValue']),
                 data=gateway_dict_json)
-            self.logger()
+            self.logger(response)
+
+    @traced
+    def set_ipv4_addressing(self, storage, addressing: list, existed_ipv4=None):
+        '''
+        The method sets address, prefix and gateway of the IPv4 objects
+        through IxNetwork multivalue patterns, so each attribute of each
+        IPv4 object is changed by one request regardless of DeviceGroup
+        multiplier (i.e. number of emulated hosts).
+
+        Multivalue hrefs of all IPv4 objects are gathered by one select
+        request (or taken from the attribute cache). Each entry of
+        "addressing" corresponds to one IPv4 object and can be one of:
+         * (address, gateway) pair of ip_interface, like demo.py builds,
+           hosts get incremental addresses starting from "address"
+         * range dictionary {'start': '10.0.0.1', 'step': '0.0.0.1',
+           'gateway': '10.0.0.254', 'gateway_step': '0.0.0.0',
+           'prefix': 24}, where steps are optional
+         * value list dictionary {'addresses': [...], 'gateways': [...],
+           'prefix': 24} with one address (and gateway) per host
+        '''
+        if not existed_ipv4:
+            existed_ipv4 = storage.ipv4
+        attributes = ['address', 'prefix', 'gatewayIp']
+        # Get multivalue hrefs of all IPv4 objects at once
+        multivalues = self.get_attributes(existed_ipv4, attributes)
+        for hrefs_dictionary, entry in zip(multivalues, addressing):
+            patterns = ipv4_multivalue_patterns(entry)
+            for attribute in attributes:
+                pattern, payload = patterns[attribute]
+                response = self.session.patch(
+                    url=''.join([
+                        self.entry_point,
+                        hrefs_dictionary[attribute],
+                        '/',
+                        pattern]),
+                    data=json.dumps(payload))
+                self.logger(response)
+
+
+def ipv4_multivalue_patterns(entry) -> dict:
+    '''
+    The function converts one addressing entry of set_ipv4_addressing()
+    into the dictionary {attribute: (multivalue pattern, payload)}.
+    '''
+    if isinstance(entry, (tuple, list)):
+        address, gateway = entry
+        entry = {
+            'start': address.ip,
+            'gateway': gateway.ip,
+            'prefix': gateway.network.prefixlen}
+    if 'addresses' in entry:
+        if not entry.get('gateways'):
+            raise ValueError(f'Addressing entry has no "gateways": {entry}')
+        address_pattern = (
+            'valueList',
+            {'values': [plain_address(address) for address in entry['addresses']]})
+        gateways = entry['gateways']
+        if len(gateways) > 1:
+            gateway_pattern = (
+                'valueList',
+                {'values': [plain_address(gateway) for gateway in gateways]})
+        else:
+            gateway_pattern = ('singleValue', {'value': plain_address(gateways[0])})
+    else:
+        for key in ('start', 'gateway'):
+            if key not in entry:
+                raise ValueError(f'Addressing entry has no "{key}": {entry}')
+        address_pattern = (
+            'counter',
+            {
+                'start': plain_address(entry['start']),
+                'step': str(entry.get('step', '0.0.0.1')),
+                'direction': 'increment'
+            })
+        if 'gateway_step' in entry:
+            gateway_pattern = (
+                'counter',
+                {
+                    'start': plain_address(entry['gateway']),
+                    'step': str(entry['gateway_step']),
+                    'direction': 'increment'
+                })
+        else:
+            gateway_pattern = ('singleValue', {'value': plain_address(entry['gateway'])})
+    return {
+        'address': address_pattern,
+        'prefix': ('singleValue', {'value': str(entry.get('prefix', 24))}),
+        'gatewayIp': gateway_pattern}
+
+
+def plain_address(address) -> str:
+    '''
+    The function returns address without prefix length for ip_interface
+    objects and string representation for anything else.
+    '''
+    return str(getattr(address, 'ip', address))
@@ -0,0 +1,184 @@
+import json
+import math
+import argparse
+import itertools
+from time import perf_counter
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+# Aggregate class and declarative scenarios for worker processes
+from src.ixnetwork_aggregate import IxNetworkRESTAPI
+from src.scenario_planner import ScenarioPlanner
+from src.certificate_cache import CertificateCache
+from src.statistics_recorder import parse_value
+
+
+def run_scenario(host: dict, session_id: int, scenario: dict) -> dict:
+    '''
+    The function runs one scenario in the worker process: builds
+    configuration from the ScenarioPlanner specification on provided
+    IxNetwork host and session, runs traffic and returns handy statistics.
+    Chassis from the inventory is used, if specification has no one.
+    '''
+    spec = dict(scenario['spec'])
+    spec.setdefault('chassis', host['chassis'])
+    started = perf_counter()
+    api = IxNetworkRESTAPI(
+        host['rest_host'], host['rest_port'], host['user'], host['password'],
+        session_id=session_id,
+        certificate_cache=CertificateCache(
+            host.get('certificate_cache', CertificateCache.DEFAULT_PATH)))
+    try:
+        ScenarioPlanner(spec).execute(api, api.storage)
+        statistics, _ = api.traffic_item_macros(duration=scenario.get('duration', 60))
+    finally:
+        api.close_rest_session()
+    return {
+        'statistics': statistics,
+        'elapsed': perf_counter() - started}
+
+
+class ResultStore():
+    '''
+    This is a concrete class that collects results of all scenarios
+    of the fleet run (successful ones and errors) and aggregates their
+    flow statistics per host and for the whole fleet.
+    '''
+
+    # Flow statistics columns, that are summed up
+    COUNTERS = ('Tx Frames', 'Rx Frames', 'Frames Delta')
+
+    def __init__(self):
+        self.results = []
+
+    def add(self, scenario: str, host: str, session_id: int, result: dict=None, error=None):
+        self.results.append({
+            'scenario': scenario,
+            'host': host,
+            'session_id': session_id,
+            'statistics': (result or {}).get('statistics'),
+            'elapsed': (result or {}).get('elapsed'),
+            'error': None if error is None else f'{type(error).__name__}: {error}'})
+
+    @staticmethod
+    def summarize(results: list) -> dict:
+        summary = {
+            'scenarios': len(results),
+            'failed': sum(1 for result in results if result['error'] is not None)}
+        summary.update({counter: 0 for counter in ResultStore.COUNTERS})
+        for result in results:
+            for direction in (result['statistics'] or {}).values():
+                for counter in ResultStore.COUNTERS:
+                    value = parse_value(direction.get(counter))
+                    # Empty markers (like '' or 'N/A') are skipped
+                    if not math.isnan(value):
+                        summary[counter] += int(value)
+        summary['Loss %'] = (
+            100.0 * (summary['Tx Frames'] - summary['Rx Frames']) / summary['Tx Frames']
+            if summary['Tx Frames'] else 0.0)
+        return summary
+
+    def aggregate(self) -> dict:
+        '''
+        The method returns summary of all flows {'total': ..., 'hosts': {}}
+        '''
+        hosts = {}
+        for result in self.results:
+            hosts.setdefault(result['host'], []).append(result)
+        return {
+            'total': self.summarize(self.results),
+            'hosts': {host: self.summarize(results) for host, results in hosts.items()}}
+
+    def to_dict(self) -> dict:
+        return {'summary': self.aggregate(), 'results': self.results}
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as results_file:
+            json.dump(self.to_dict(), results_file, indent=4)
+
+
+class FleetRunner():
+    '''
+    This is a concrete class that distributes scenarios across several
+    IxNetwork API hosts (and their chassis) and runs them concurrently
+    in worker processes.
+
+    Inventory is a dictionary like this:
+
+        hosts:
+          - name: api1
+            rest_host: 192.168.1.1
+            rest_port: '443'
+            user: admin
+            password: admin
+            chassis: 192.168.100.1
+            sessions: [1, 2, 3]
+
+    Optional "certificate_cache" is a path to the host certificates cache
+    (null for in-memory cache). Each host runs at most one scenario per
+    IxNetwork session from the "sessions" list (so its length is the host
+    concurrency limit, default is only session 1). Scenario is a dictionary
+    {'name': ..., 'spec': ScenarioPlanner specification, 'duration': traffic
+    duration}. Scenarios are taken from the queue in order, as soon as any
+    host session is free. Free sessions are used in round-robin order, so
+    the load is spread across hosts.
+    '''
+
+    def __init__(self, inventory: dict, max_workers: int=None):
+        self.hosts = {host['name']: host for host in inventory['hosts']}
+        # (host, session id) slots, interleaved across hosts
+        self.slots = [
+            slot
+            for slots in itertools.zip_longest(*[
+                [(name, session_id) for session_id in host.get('sessions', [1])]
+                for name, host in self.hosts.items()])
+            for slot in slots if slot is not None]
+        if not self.slots:
+            raise ValueError('There are no IxNetwork sessions in the inventory')
+        self.max_workers = max_workers or len(self.slots)
+        self.store = ResultStore()
+
+    def run(self, scenarios: list) -> ResultStore:
+        '''
+        The method runs all scenarios and returns the store with results
+        '''
+        queue = deque(scenarios)
+        free_slots = deque(self.slots)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            while queue or futures:
+                # Fill free slots of all hosts
+                while queue and free_slots and len(futures) < self.max_workers:
+                    scenario = queue.popleft()
+                    name, session_id = slot = free_slots.popleft()
+                    future = executor.submit(
+                        run_scenario, self.hosts[name], session_id, scenario)
+                    futures[future] = (scenario, slot)
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    scenario, slot = futures.pop(future)
+                    free_slots.append(slot)
+                    error = future.exception()
+                    self.store.add(
+                        scenario.get('name'), slot[0], slot[1],
+                        result=None if error is not None else future.result(),
+                        error=error)
+        return self.store
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Runs scenarios across fleet of IxNetwork hosts')
+    parser.add_argument('inventory', help='JSON file with hosts inventory')
+    parser.add_argument('scenarios', help='JSON file with list of scenarios')
+    parser.add_argument('--output', default='fleet_results.json')
+    arguments = parser.parse_args()
+    with open(arguments.inventory, 'r', encoding='utf-8') as inventory_file:
+        inventory = json.load(inventory_file)
+    with open(arguments.scenarios, 'r', encoding='utf-8') as scenarios_file:
+        scenarios = json.load(scenarios_file)
+    store = FleetRunner(inventory).run(scenarios)
+    store.save(arguments.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+import re
+import json
+
+from src.select_query import SelectQuery
+from src.core_network_mixin import ipv4_multivalue_patterns
+from src.traffic_operations_mixin import traffic_item_payloads
+from src.service_operations_mixin import ServiceOperationsMixin
+from src.instrumentation import traced
+
+
+class ImportConfigMixin(ServiceOperationsMixin):
+    '''
+    This is a mixin class. It only contains specific methods
+    and can't be instantiate (due to inheritance from ABC class).
+
+    This class contains alternative backend for objects creation methods.
+    If session backend is 'importconfig', then create_topology(),
+    create_device_groups(), create_ethernet(), create_ipv4() and
+    set_ipv4_addressing() don't send any requests, but stage objects
+    into local configuration tree (list of xpath entries). Whole tree is
+    pushed by push_config() with single resourceManager importconfig
+    operation. For the 'rest' backend methods are passed to the
+    per-object REST mixins.
+
+    Staged objects get their future hrefs in Storage immediately, so
+    the methods can be chained exactly like the REST ones. Ids of new
+    objects continue ids of the objects, that already exist in IxNetwork
+    config (they are read by one select per object type), and ids staged
+    before. push_config() with storage rebuilds it from the hrefs reported
+    by IxNetwork after the import. new_config() and load_config() drop
+    staged objects, that aren't pushed yet.
+
+    Many traffic items are created by create_traffic_items() with one
+    importconfig operation for any backend.
+    '''
+
+    # Nodes from the root to each staged child, all of them are selected
+    CHILD_PATHS: dict = {
+        'topology': ['topology'],
+        'deviceGroup': ['topology', 'deviceGroup'],
+        'ethernet': ['topology', 'deviceGroup', 'ethernet'],
+        'ipv4': ['topology', 'deviceGroup', 'ethernet', 'ipv4'],
+        'trafficItem': ['traffic', 'trafficItem']}
+
+    def staging(self):
+        '''
+        The method returns True if objects should be staged
+        '''
+        return getattr(self, 'backend', 'rest') == 'importconfig'
+
+    @property
+    def staged_config(self) -> list:
+        '''
+        Staged xpath entries, that aren't pushed yet
+        '''
+        if getattr(self, '_staged_config', None) is None:
+            self._staged_config = []
+        return self._staged_config
+
+    @property
+    def staged_indexes(self) -> dict:
+        '''
+        The last used ids of children {child: {parent xpath: id}}
+        '''
+        if getattr(self, '_staged_indexes', None) is None:
+            self._staged_indexes = {}
+        return self._staged_indexes
+
+    def invalidate_select_cache(self):
+        '''
+        The method drops all cached select results, so the last used ids
+        of children are read from IxNetwork again (ids of staged objects,
+        that aren't pushed yet, are kept, see last_indexes())
+        '''
+        super().invalidate_select_cache()
+        self.staged_indexes.clear()
+
+    def discard_staged_config(self):
+        '''
+        The method drops staged configuration, that isn't pushed yet,
+        together with the last used ids (e.g. when IxNetwork config
+        is replaced, so staged objects point to the removed ones)
+        '''
+        self.staged_config.clear()
+        self.staged_indexes.clear()
+
+    def load_config(self, filename: str):
+        '''
+        ServiceOperationsMixin.load_config(), that also drops staged
+        configuration
+        '''
+        super().load_config(filename)
+        self.discard_staged_config()
+
+    def last_indexes(self, child: str) -> dict:
+        '''
+        The method returns the last used ids of children of provided type
+        {parent xpath: id}. Ids of existing objects are read by one select,
+        ids of staged objects are taken from the staged configuration.
+        '''
+        if child not in self.staged_indexes:
+            indexes = self.staged_indexes[child] = {}
+            query = SelectQuery(self.api_root)
+            for node in ImportConfigMixin.CHILD_PATHS.get(child, [child]):
+                query.child(node, ['id'] if node == child else [])
+            result, = self.select(query)
+            stack = [result.to_dict()]
+            while stack:
+                entry = stack.pop()
+                for key, value in entry.items():
+                    if isinstance(value, list) and value and isinstance(value[0], dict):
+                        stack.extend(value)
+                parent_href, object_type, object_id = (
+                    entry.get('href', '').rsplit('/', 2) + ['', ''])[:3]
+                if object_type == child and object_id.isdigit():
+                    parent_xpath = href_to_xpath(parent_href)
+                    indexes[parent_xpath] = max(
+                        indexes.get(parent_xpath, 0), int(object_id))
+            pattern = re.compile(rf'(.*)/{child}\[(\d+)\]')
+            for entry in self.staged_config:
+                match = pattern.fullmatch(entry['xpath'])
+                if match is not None:
+                    parent_xpath = match.group(1)
+                    indexes[parent_xpath] = max(
+                        indexes.get(parent_xpath, 0), int(match.group(2)))
+        return self.staged_indexes[child]
+
+    def stage_children(self, parent_hrefs, child: str, payloads):
+        '''
+        The method adds child object for each parent into the staged
+        configuration and returns future hrefs of the created objects.
+        '''
+        indexes = self.last_indexes(child)
+        hrefs = []
+        for parent_href, payload in zip(parent_hrefs, payloads):
+            parent_xpath = href_to_xpath(parent_href)
+            index = indexes[parent_xpath] = indexes.get(parent_xpath, 0) + 1
+            xpath = f'{parent_xpath}/{child}[{index}]'
+            self.staged_config.append(dict(payload, xpath=xpath))
+            hrefs.append(xpath_to_href(xpath, self.api_root))
+        return hrefs
+
+    def create_topology(self, storage, existed_vports=None, bulk: bool=False):
+        '''
+        Staged version of MainObjectsMixin.create_topology()
+        '''
+        if not self.staging():
+            return super().create_topology(storage, existed_vports, bulk)
+        if not existed_vports:
+            existed_vports = storage.vports
+        storage.topologies = self.stage_children(
+            [self.api_root] * len(existed_vports),
+            'topology',
+            [{'ports': [href_to_xpath(port_href)]} for port_href in existed_vports])
+
+    def create_device_groups(
+            self,
+            storage,
+            existed_topologies=None,
+            multiplier: int=1,
+            bulk: bool=False):
+        '''
+        Staged version of MainObjectsMixin.create_device_groups()
+        '''
+        if not self.staging():
+            return super().create_device_groups(
+                storage, existed_topologies, multiplier, bulk)
+        if not existed_topologies:
+            existed_topologies = storage.topologies
+        storage.device_groups = self.stage_children(
+            existed_topologies,
+            'deviceGroup',
+            [
+                {'multiplier': multiplier, 'name': topology_href[-1]}
+                for topology_href in existed_topologies
+            ])
+
+    def create_ethernet(
+            self,
+            storage,
+            existed_device_groups=None,
+            bulk: bool=False):
+        '''
+        Staged version of CoreNetworkObjectsMixin.create_ethernet()
+        '''
+        if not self.staging():
+            return super().create_ethernet(storage, existed_device_groups, bulk)
+        if not existed_device_groups:
+            existed_device_groups = storage.device_groups
+        storage.ethernets = self.stage_children(
+            existed_device_groups,
+            'ethernet',
+            [{}] * len(existed_device_groups))
+
+    def create_ipv4(
+            self,
+            storage,
+            existed_ethernets=None,
+            bulk: bool=False):
+        '''
+        Staged version of CoreNetworkObjectsMixin.create_ipv4()
+        '''
+        if not self.staging():
+            return super().create_ipv4(storage, existed_ethernets, bulk)
+        if not existed_ethernets:
+            existed_ethernets = storage.ethernets
+        storage.ipv4 = self.stage_children(
+            existed_ethernets,
+            'ipv4',
+            [{}] * len(existed_ethernets))
+
+    def set_ipv4_addressing(self, storage, addressing: list, existed_ipv4=None):
+        '''
+        Staged version of CoreNetworkObjectsMixin.set_ipv4_addressing()
+        '''
+        if not self.staging():
+            return super().set_ipv4_addressing(storage, addressing, existed_ipv4)
+        if not existed_ipv4:
+            existed_ipv4 = storage.ipv4
+        for ipv4_href, entry in zip(existed_ipv4, addressing):
+            patterns = ipv4_multivalue_patterns(entry)
+            for attribute, (pattern, payload) in patterns.items():
+                source = f'{href_to_xpath(ipv4_href)} {attribute}'
+                self.staged_config.append(dict(
+                    payload,
+                    xpath=f"/multivalue[@source = '{source}']/{pattern}"))
+
+    def change_ipv4_address(self, storage, addresses: list):
+        '''
+        Staged version of CoreNetworkObjectsMixin.change_ipv4_address()
+        '''
+        if not self.staging():
+            return super().change_ipv4_address(storage, addresses)
+        self.set_ipv4_addressing(storage, addresses)
+
+    @traced
+    def create_traffic_items(self, specs: list, storage=None) -> list:
+        '''
+        The method creates many traffic items at once. Each spec is
+        a dictionary of create_traffic_item() arguments (hrefs, name,
+        trafficType, frame_parameters, flow_groups). Items with all their
+        endpoint sets, frame settings and tracking are pushed by one
+        importconfig operation and then generated by one operation,
+        instead of 6 requests per item.
+
+        For the 'importconfig' backend items are only staged and will be
+        pushed (and should be generated) after push_config().
+        The method returns hrefs of the new traffic items, reported by
+        IxNetwork after the import (they are also saved to the storage,
+        if provided).
+        '''
+        payloads = [
+            traffic_item_payloads(**dict(spec, hrefs=[
+                href_to_xpath(href) for href in spec['hrefs']]))
+            for spec in specs]
+        if self.staging():
+            hrefs = self.stage_children(
+                [f'{self.api_root}/traffic'] * len(payloads),
+                'trafficItem',
+                [item_payloads.pop('') for item_payloads in payloads])
+            self.staged_config.extend(traffic_item_entries(hrefs, payloads))
+        else:
+            existed = self.traffic_item_hrefs()
+            next_id = 1 + max(
+                [int(href.split('/')[-1]) for href in existed], default=0)
+            # Xpaths of imported objects should have ids
+            xpath_hrefs = [
+                f'{self.api_root}/traffic/trafficItem/{item_id}'
+                for item_id in range(next_id, next_id + len(payloads))]
+            self.import_config(traffic_item_entries(xpath_hrefs, payloads))
+            self.invalidate_select_cache()
+            # Hrefs of the created items are taken from IxNetwork
+            existed = set(existed)
+            hrefs = [href for href in self.traffic_item_hrefs() if href not in existed]
+            self.generate_traffic_item(hrefs)
+        if storage is not None:
+            for href in hrefs:
+                storage.add(href)
+        return hrefs
+
+    def import_config(self, entries: list):
+        '''
+        The method imports list of xpath entries to the IxNetwork by one
+        resourceManager importconfig operation and waits for its completion
+        '''
+        import_dict_json = json.dumps(
+            {
+                'arg1': f'{self.api_root}/resourceManager',
+                'arg2': json.dumps(entries),
+                'arg3': False
+            })
+        response = self.session.post(
+            url=''.join([
+                self.entry_point,
+                self.api_root, '/resourceManager/operations/importconfig']),
+            data=import_dict_json)
+        self.logger(response)
+        self.wait_for_operation(response)
+
+    @traced
+    def push_config(self, storage=None):
+        '''
+        The method pushes staged configuration to the IxNetwork by one
+        resourceManager importconfig operation, waits for its completion
+        and clears staged configuration. If storage is provided, it is
+        rebuilt from the objects reported by IxNetwork after the import.
+        '''
+        self.import_config(self.staged_config)
+        self.staged_config.clear()
+        if storage is not None:
+            self.synchronize_storage(storage)
+
+
+def href_to_xpath(href: str) -> str:
+    '''
+    The function converts REST href of configuration object into the
+    xpath, like "/api/v1/sessions/1/ixnetwork/topology/1/deviceGroup/2"
+    into "/topology[1]/deviceGroup[2]"
+    '''
+    path = re.sub(r'^/api/v1/sessions/\d+/ixnetwork', '', href)
+    return re.sub(r'/(\w+)/(\d+)', r'/\1[\2]', path)
+
+
+def xpath_to_href(xpath: str, api_root: str) -> str:
+    '''
+    The function converts xpath of configuration object into its REST href
+    inside IxNetwork session with provided root
+    '''
+    return ''.join([
+        api_root,
+        re.sub(r'/(\w+)\[(\d+)\]', r'/\1/\2', xpath)])
+
+
+def traffic_item_entries(hrefs: list, payloads: list) -> list:
+    '''
+    The function converts payloads of traffic items (see
+    traffic_item_payloads()) into the importconfig xpath entries
+    '''
+    return [
+        dict(payload, xpath=href_to_xpath(href + path))
+        for href, item_payloads in zip(hrefs, payloads)
+        for path, payload in item_payloads.items()]
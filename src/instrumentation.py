@@ -0,0 +1,225 @@
+import re
+import json
+import bisect
+import threading
+import functools
+from itertools import count
+from contextlib import contextmanager
+from time import perf_counter
+from urllib.parse import urlsplit
+
+
+class EndpointStatistics():
+    '''
+    This is a concrete class that accumulates statistics of requests
+    for one (method, endpoint) pair
+    '''
+
+    # Upper bounds of latency histogram buckets (in seconds)
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    __slots__ = (
+        'count', 'latency_sum', 'latency_max', 'histogram',
+        'request_bytes', 'response_bytes', 'statuses')
+
+    def __init__(self):
+        self.count = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        # The last bucket is +Inf
+        self.histogram = [0] * (len(EndpointStatistics.BUCKETS) + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses = {}
+
+    def record(self, latency: float, request_bytes: int, response_bytes: int, status: int):
+        self.count += 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.histogram[bisect.bisect_left(EndpointStatistics.BUCKETS, latency)] += 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'latency_sum': self.latency_sum,
+            'latency_avg': self.latency_sum / self.count if self.count else 0.0,
+            'latency_max': self.latency_max,
+            'histogram': dict(zip(
+                [str(bound) for bound in EndpointStatistics.BUCKETS] + ['+Inf'],
+                self.histogram)),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'statuses': dict(self.statuses)}
+
+
+class Instrumentation():
+    '''
+    This is a concrete class that records every HTTP exchange of the
+    requests.Session (through response hook): count, latency histogram,
+    payload sizes and status codes per method and endpoint. Numeric ids in
+    urls are replaced by {id}, so e.g. all topologies share one endpoint.
+
+    Besides, it records spans: one span per traced mixin method call
+    (see traced()) with HTTP spans of its requests inside. Spans can be
+    exported as Chrome trace (chrome://tracing, Perfetto).
+    '''
+
+    ID_PATTERN = re.compile(r'/\d+(?=/|$)')
+
+    def __init__(self, max_spans: int=100000):
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._endpoints = {}
+        self._spans = []
+        self._span_ids = count(1)
+        self._origin = perf_counter()
+
+    def attach(self, session):
+        '''
+        The method adds response hook to the requests.Session
+        '''
+        session.hooks.setdefault('response', []).append(self.on_response)
+
+    @staticmethod
+    def endpoint(url: str) -> str:
+        return Instrumentation.ID_PATTERN.sub('/{id}', urlsplit(url).path)
+
+    def on_response(self, response, *args, **kwargs):
+        '''
+        Hook for requests.Session. Response bodies are not read here (they
+        can be streamed), so sizes are taken from Content-Length.
+        '''
+        finished = perf_counter()
+        latency = response.elapsed.total_seconds()
+        request = response.request
+        endpoint = self.endpoint(request.url)
+        request_bytes = int(request.headers.get('Content-Length', 0) or 0)
+        response_bytes = int(response.headers.get('Content-Length', 0) or 0)
+        with self._lock:
+            key = (request.method, endpoint)
+            statistics = self._endpoints.get(key)
+            if statistics is None:
+                statistics = self._endpoints[key] = EndpointStatistics()
+            statistics.record(latency, request_bytes, response_bytes, response.status_code)
+        self.add_span(
+            f'{request.method} {endpoint}', 'http', finished - latency, finished,
+            {'status': response.status_code, 'url': request.url})
+        return response
+
+    def add_span(self, name: str, category: str, started: float, finished: float, args=None):
+        stack = getattr(self._local, 'stack', [])
+        span = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (started - self._origin) * 1e6,
+            'dur': (finished - started) * 1e6,
+            'pid': 1,
+            'tid': threading.get_ident(),
+            'args': dict(args or {}, id=next(self._span_ids),
+                         parent=stack[-1] if stack else None)}
+        with self._lock:
+            if len(self._spans) < self.max_spans:
+                self._spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name: str):
+        '''
+        Context manager, that records span around the block. HTTP spans
+        of requests inside the block become its children.
+        '''
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        span_id = next(self._span_ids)
+        stack.append(span_id)
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            span = self.add_span(name, 'method', started, perf_counter())
+            span['args']['id'] = span_id
+
+    def snapshot(self) -> dict:
+        '''
+        The method returns statistics {"METHOD endpoint": {...}}
+        '''
+        with self._lock:
+            return {
+                f'{method} {endpoint}': statistics.to_dict()
+                for (method, endpoint), statistics in self._endpoints.items()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._spans.clear()
+
+    def prometheus(self) -> str:
+        '''
+        The method returns statistics in Prometheus text exposition format
+        '''
+        with self._lock:
+            endpoints = [
+                (f'method="{method}",endpoint="{endpoint}"', statistics)
+                for (method, endpoint), statistics in self._endpoints.items()]
+        bounds = [str(bound) for bound in EndpointStatistics.BUCKETS] + ['+Inf']
+        # Each metric family is one group right after its TYPE line
+        lines = ['# TYPE ixnetwork_request_duration_seconds histogram']
+        for labels, statistics in endpoints:
+            cumulative = 0
+            for bound, bucket in zip(bounds, statistics.histogram):
+                cumulative += bucket
+                lines.append(
+                    'ixnetwork_request_duration_seconds_bucket'
+                    f'{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(
+                'ixnetwork_request_duration_seconds_sum'
+                f'{{{labels}}} {statistics.latency_sum}')
+            lines.append(
+                'ixnetwork_request_duration_seconds_count'
+                f'{{{labels}}} {statistics.count}')
+        lines.append('# TYPE ixnetwork_request_bytes_total counter')
+        for labels, statistics in endpoints:
+            lines.append(f'ixnetwork_request_bytes_total{{{labels}}} {statistics.request_bytes}')
+        lines.append('# TYPE ixnetwork_response_bytes_total counter')
+        for labels, statistics in endpoints:
+            lines.append(f'ixnetwork_response_bytes_total{{{labels}}} {statistics.response_bytes}')
+        lines.append('# TYPE ixnetwork_responses_total counter')
+        for labels, statistics in endpoints:
+            for status, status_count in statistics.statuses.items():
+                lines.append(
+                    f'ixnetwork_responses_total{{{labels},status="{status}"}} {status_count}')
+        return '\n'.join(lines) + '\n'
+
+    def chrome_trace(self, path: str=None) -> dict:
+        '''
+        The method returns spans in Chrome trace event format and writes
+        them to the file if path is provided
+        '''
+        with self._lock:
+            trace = {'traceEvents': list(self._spans), 'displayTimeUnit': 'ms'}
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as trace_file:
+                json.dump(trace, trace_file)
+        return trace
+
+
+def traced(method):
+    '''
+    Decorator for mixin methods. If session has instrumentation,
+    the method call is recorded as a span.
+    '''
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = getattr(self, 'instrumentation', None)
+        if instrumentation is None:
+            return method(self, *args, **kwargs)
+        with instrumentation.span(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -1,21 +1,25 @@
 import os
-import ssl
 import json
-import logging
-import warnings
 import requests
-import subprocess
-from urllib3.exceptions import SubjectAltNameWarning
+from time import sleep
 # Custom mixin classes with IxNetwork specific methods
 from src.service_operations_mixin import ServiceOperationsMixin
 from src.main_objects_mixin import MainObjectsMixin
 from src.core_network_mixin import CoreNetworkObjectsMixin
 from src.traffic_macroses_mixin import TrafficMacrosesMixin
+from src.import_config_mixin import ImportConfigMixin
 # Custom component class for storing IxNetwork Resources
 from src.storage_component import Storage
+# Custom component class for requests logging
+from src.request_logger import RequestLogger
+# Custom component class for requests instrumentation
+from src.instrumentation import Instrumentation
+# Custom component class for caching of self-signed certificates
+from src.certificate_cache import CertificateCache, PinnedAdapter
 
 
 class IxNetworkRESTAPI(
+        ImportConfigMixin,
         ServiceOperationsMixin,
         MainObjectsMixin,
         CoreNetworkObjectsMixin,
@@ -28,27 +32,68 @@ class IxNetworkRESTAPI(
     class, ready for use to end user.
 
     Here and anywhere bellow we are implicit that IxNetwork has only
-    self-signed certificate
+    self-signed certificate. It is fetched once and kept in the
+    certificate_cache, connections are verified by its fingerprint.
+
+    If lazy is True, constructor doesn't make any request, session is made
+    on the first access to the "session" attribute. If clear_config is
+    False, existing IxNetwork config is kept (no newconfig operation).
+    Argument session_id selects IxNetwork session, if api_key is provided
+    user isn't authenticated again (see save_session() and reattach()).
+
+    Argument backend selects how configuration objects are created:
+    'rest' creates each object by REST requests, 'importconfig' stages
+    objects locally until push_config() is called. Argument request_logger
+    allows to tune requests logging (sampling, truncation, JSON lines).
+    If instrumentation is provided, it records statistics of every request
+    and spans of mixin methods calls. Argument transport is an optional
+    requests transport adapter for the session, e.g. RecordingAdapter to
+    record all exchanges to the cassette or ReplayAdapter to replay them
+    without IxNetwork host (see src/transport.py).
     '''
+
+    BACKENDS = ('rest', 'importconfig')
+
     def __init__(
             self,
             rest_host: str,
             rest_port: str,
             user: str,
-            password: str):
+            password: str,
+            backend: str = 'rest',
+            request_logger: RequestLogger = None,
+            instrumentation: Instrumentation = None,
+            transport: requests.adapters.BaseAdapter = None,
+            lazy: bool = False,
+            clear_config: bool = True,
+            certificate_cache: CertificateCache = None,
+            session_id: int = 1,
+            api_key: str = None):
+        if backend not in IxNetworkRESTAPI.BACKENDS:
+            raise ValueError(f'"{backend}" is not supported backend')
+        self.backend = backend
+        self.request_logger = request_logger or RequestLogger()
+        self.instrumentation = instrumentation
+        self.transport = transport
+        self.clear_config = clear_config
+        self.certificate_cache = certificate_cache or CertificateCache()
+        self.__session = None
+        self.__closed = False
+        self.__session_id = int(session_id)
+        self.api_key = api_key
         # Conversion to the string for safety
         self.__rest_host = str(rest_host)
         self.__rest_port = str(rest_port)
         self.__username = str(user)
         self.__password = str(password)
+        # Hostname of the default IxNetwork self-signed certificate
         self.__hostname = 'ixnetwork-self-host'
-        self.__entry_point = f'https://{self.hostname}:{self.rest_port}'
-        # Essential methods invoking
-        self.certificate_preparation()
-        self.resolve_hostname_mismatch()
-        self.make_rest_session()
+        self.__entry_point = f'https://{self.rest_host}:{self.rest_port}'
         # Initialize storage
         self.storage = Storage()
+        # Essential methods invoking
+        if not lazy:
+            self.make_rest_session()
 
     # These attributes are private and should not been change during
     # all the object life.
@@ -76,6 +121,34 @@ class IxNetworkRESTAPI(
     def entry_point(self):
         return self.__entry_point
 
+    @property
+    def session_id(self):
+        return self.__session_id
+
+    @property
+    def api_root(self):
+        return f'/api/v1/sessions/{self.session_id}/ixnetwork'
+
+    # Session is made on the first access in lazy mode, but closed
+    # session isn't made again implicitly (see make_rest_session())
+    @property
+    def session(self):
+        if self.__session is None:
+            if self.__closed:
+                raise RuntimeError(
+                    'Session to the IxNetwork host is closed, '
+                    'call make_rest_session() to make new one')
+            self.make_rest_session()
+        return self.__session
+
+    @session.setter
+    def session(self, value):
+        self.__session = value
+
+    @session.deleter
+    def session(self):
+        self.__session = None
+
     def __repr__(self):
         '''
         Representation should allow developer construct identically
@@ -87,109 +160,140 @@ class IxNetworkRESTAPI(
             '(',
             ', '.join([
                 repr(self.rest_host), repr(self.rest_port),
-                repr(self.username), repr(self.password)]),
+                repr(self.username), repr(self.password)] + (
+                    [f'backend={self.backend!r}']
+                    if self.backend != 'rest' else []) + (
+                    [f'clear_config={self.clear_config!r}']
+                    if not self.clear_config else []) + (
+                    [f'session_id={self.session_id!r}']
+                    if self.session_id != 1 else [])),
             ')'])
         return representation
 
-    def logger(self):
+    def logger(self, response, content: bool=True):
         '''
-        Simple wrapper around logging with few format strings preset for
-        pretty printing INFO logging messages.
+        Simple wrapper around RequestLogger, that logs request and
+        response. Formatting is done only if logging level is enabled.
 
         Also, here we implicit, that main module already have logger, so
         we just get it with its config.
+
+        For streamed responses "content" should be False, so the body
+        isn't read into memory.
         '''
-        if self.response.request.body is not None:
-            body = ''.join([
-                '\n', json.dumps(
-                    json.loads(
-                        self.response.request.body), indent=4)])
-        else:
-            body = 'None'
-        status = ' '.join([
-            str(self.response.status_code), self.response.reason])
-        # Not all response content has a valid JSON representation, especially if
-        # it is binary file. So here we must catch and handle exceptions.
-        try:
-            self.response_json = ''.join([
-                '\n', json.dumps(
-                    self.response.json(), indent=4)])
-        except json.decoder.JSONDecodeError:
-            self.response_json = 'Binary content'
-        fmt_info = (
-            f'\nREQUEST'
-            f'\nURL:     {self.response.request.url}'
-            f'\nHeaders: {self.response.request.headers}'
-            f'\nJSON:    {body}'
-            f'\nRESPONSE'
-            f'\nStatus:  {status}'
-            f'\nHeaders: {self.response.headers}'
-            f'\nJSON:    {self.response_json}')
-        logging.getLogger(__name__).info(fmt_info)
-
-    def certificate_preparation(self):
-        '''
-        The method gets self-signed certificate from remote IxNetwork server
-        and sets it as trusted CA. It prevents security warnings from appearing.
-        '''
-        # Get server self-signed certificate
-        ixia_self_signed_sert = ssl.get_server_certificate(
-            (self.rest_host, self.rest_port))
-        with open('/root/cert.pem', 'w', encoding='utf-8') as cert_file:
-            cert_file.write(ixia_self_signed_sert)
-        # Set retrieved certificate as trusted for requests library
-        # through specific env attribute
-        os.environ['REQUESTS_CA_BUNDLE'] = '/root/cert.pem'
-
-    def resolve_hostname_mismatch(self):
-        '''
-        Due to default IxNetwork self-signed certificate has hostname
-        'IxNetwork-Self-Host', that doesn't match his real DNS name,
-        here we use workaround - just putting it into the /etc/hosts,
-        if it not exists there already.
-        '''
-        # Set mapping between IP and hostname in certificate
-        cmd = ['echo', self.rest_host, self.hostname, '>>', '/etc/hosts']
-        with open('/etc/hosts', 'r') as hosts_file:
-            unique_hosts = set(hosts_file.read().split('\n'))
-        if ' '.join([self.rest_host, self.hostname]) not in unique_hosts:
-            # It seems that shell is must be here, through it is unsafe
-            subprocess.call(' '.join(cmd), shell=True)
-        # Supress warning about absence of subjectAltName in the certificate
-        # "Certificate for ixnetwork-self-host has no `subjectAltName`"
-        warnings.simplefilter('ignore', SubjectAltNameWarning)
+        self.request_logger.log(response, content)
+
+    def pause(self, seconds: float):
+        '''
+        The method waits provided time (e.g. between polls of operation
+        state). Replay of recorded session doesn't wait at all.
+        '''
+        if not getattr(self.transport, 'offline', False):
+            sleep(seconds)
+
+    def mount_adapter(self, adapter: requests.adapters.BaseAdapter):
+        '''
+        The method mounts transport adapter to the session. Connections of
+        PinnedAdapter are pinned to the IxNetwork self-signed certificate,
+        so it prevents security warnings from appearing without any
+        changes in trusted CA or /etc/hosts.
+        '''
+        if isinstance(adapter, PinnedAdapter):
+            adapter.fingerprint = self.certificate_cache.fingerprint(
+                self.rest_host, self.rest_port)
+        self.session.mount('https://', adapter)
 
     def make_rest_session(self):
         '''
-        The method provides user authentication and sets up Ixnetwork
-        configuration to the default state.
+        The method provides user authentication (if there is no api_key yet)
+        and sets up Ixnetwork configuration to the default state (if
+        clear_config is True).
         '''
-        # For authentication we are using simple dictionary
-        auth_dict_json = json.dumps(
-            {'username': self.username, 'password': self.password},
-            ensure_ascii=True)
+        self.__closed = False
         # Create session and set default headers
         self.session = requests.Session()
         self.session.headers = {'Content-Type': 'application/json; charset=us-ascii'}
-        # Authenticate user
-        self.response = self.session.post(
-            url=''.join([self.entry_point, '/api/v1/auth/session']),
-            data=auth_dict_json)
-        self.logger()
+        self.mount_adapter(self.transport or PinnedAdapter())
+        if self.instrumentation is not None:
+            self.instrumentation.attach(self.session)
+        if self.api_key is None:
+            # For authentication we are using simple dictionary
+            auth_dict_json = json.dumps(
+                {'username': self.username, 'password': self.password},
+                ensure_ascii=True)
+            # Authenticate user
+            response = self.session.post(
+                url=''.join([self.entry_point, '/api/v1/auth/session']),
+                data=auth_dict_json)
+            self.logger(response)
+            self.api_key = response.json()['apiKey']
         # Set retrieved auth token
-        self.session.headers['apiKey'] = self.response.json()['apiKey']
-        self.session.headers['username'] = self.response.json()['username']
-        # Erase previous config and setting up new one
-        self.response = self.session.post(
+        self.session.headers['apiKey'] = self.api_key
+        self.session.headers['username'] = self.username
+        if self.clear_config:
+            self.new_config()
+        else:
+            # Cached reads may be not valid for the existing config
+            self.invalidate_select_cache()
+            self.attribute_cache.clear()
+
+    def new_config(self):
+        '''
+        The method erases previous config and sets up new one
+        '''
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/operations/newconfig']))
-        self.logger()
+                self.api_root, '/operations/newconfig']))
+        self.logger(response)
+        # Cached reads and staged objects are not valid for the new config
+        self.discard_staged_config()
+        self.invalidate_select_cache()
+        self.attribute_cache.clear()
+
+    def save_session(self, path: str):
+        '''
+        The method saves everything needed to reattach to this IxNetwork
+        session later (see reattach()). File contains api key, so it is
+        readable only by the owner.
+        '''
+        # Api key is needed, so session should be made
+        self.session
+        state = {
+            'rest_host': self.rest_host,
+            'rest_port': self.rest_port,
+            'username': self.username,
+            'session_id': self.session_id,
+            'api_key': self.api_key}
+        descriptor = os.open(f'{path}.tmp', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(descriptor, 'w', encoding='utf-8') as session_file:
+            json.dump(state, session_file, indent=4)
+        os.replace(f'{path}.tmp', path)
+
+    @classmethod
+    def reattach(cls, path: str, **kwargs):
+        '''
+        The method makes instance attached to the existing IxNetwork session
+        saved by save_session(): without authentication and newconfig.
+        Storage is rebuilt from the objects already present in the config,
+        so the build phase can be skipped entirely.
+        '''
+        with open(path, 'r', encoding='utf-8') as session_file:
+            state = json.load(session_file)
+        kwargs.setdefault('clear_config', False)
+        instance = cls(
+            state['rest_host'], state['rest_port'], state['username'], '',
+            session_id=state['session_id'], api_key=state['api_key'], **kwargs)
+        instance.synchronize_storage(instance.storage)
+        return instance
 
     def close_rest_session(self):
         '''
         The method closes session to the IxNetwork host
         and deletes reference to the main session object
         '''
-        self.session.close()
+        # Lazy session can be not made at all
+        if self.__session is not None:
+            self.__session.close()
         del self.session
+        self.__closed = True
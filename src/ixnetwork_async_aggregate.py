@@ -0,0 +1,97 @@
+from concurrent.futures import ThreadPoolExecutor
+# Custom mixin class with coroutine versions of objects creation methods
+from src.async_network_mixin import AsyncNetworkObjectsMixin
+# Synchronous aggregate class provides all the rest functionality
+from src.ixnetwork_aggregate import IxNetworkRESTAPI
+# Transport adapter pinned to the IxNetwork certificate
+from src.certificate_cache import PinnedAdapter
+
+
+class AsyncIxNetworkRESTAPI(AsyncNetworkObjectsMixin, IxNetworkRESTAPI):
+    '''
+    It is an asyncio variant of IxNetworkRESTAPI aggregate class.
+
+    Methods create_topology(), create_device_groups(), create_ethernet(),
+    create_ipv4() and change_ipv4_address() are coroutines here and should
+    be awaited (or run with asyncio.run()). All other methods, like
+    assign_ports() or traffic operations, are the same blocking methods
+    as in IxNetworkRESTAPI.
+
+    Argument max_in_flight limits the number of concurrent requests
+    to the IxNetwork host. Other keyword arguments are the same as
+    for IxNetworkRESTAPI, only 'rest' backend is supported (coroutines
+    always send requests, so objects can't be staged).
+    '''
+    def __init__(
+            self,
+            rest_host: str,
+            rest_port: str,
+            user: str,
+            password: str,
+            max_in_flight: int = 16,
+            **kwargs):
+        if kwargs.get('backend', 'rest') != 'rest':
+            raise ValueError(
+                f'"{kwargs["backend"]}" backend is not supported by {type(self).__name__}')
+        self.__max_in_flight = int(max_in_flight)
+        self.__executor = None
+        super().__init__(rest_host, rest_port, user, password, **kwargs)
+
+    @property
+    def max_in_flight(self):
+        return self.__max_in_flight
+
+    @property
+    def executor(self):
+        '''
+        Executor threads are started on first usage and again after
+        close_rest_session()
+        '''
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        return self.__executor
+
+    @executor.setter
+    def executor(self, executor):
+        self.__executor = executor
+
+    def __repr__(self):
+        '''
+        Representation should allow developer construct identically
+        instance of class base on it.
+        So we want to eval(repr(self)) == self
+        '''
+        representation: str = ''.join([
+            type(self).__name__,
+            '(',
+            ', '.join([
+                repr(self.rest_host), repr(self.rest_port),
+                repr(self.username), repr(self.password),
+                f'max_in_flight={self.max_in_flight!r}'] + (
+                    [f'clear_config={self.clear_config!r}']
+                    if not self.clear_config else []) + (
+                    [f'session_id={self.session_id!r}']
+                    if self.session_id != 1 else [])),
+            ')'])
+        return representation
+
+    def make_rest_session(self):
+        '''
+        The method makes ordinary IxNetwork session and enlarges session
+        connection pool, so each request in flight has its own connection.
+        '''
+        super().make_rest_session()
+        # Custom transport adapter is kept as is
+        if self.transport is None:
+            self.mount_adapter(PinnedAdapter(
+                pool_connections=1, pool_maxsize=self.max_in_flight))
+
+    def close_rest_session(self):
+        '''
+        The method closes session to the IxNetwork host and stops
+        executor threads
+        '''
+        super().close_rest_session()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
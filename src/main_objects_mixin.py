@@ -1,8 +1,9 @@
 import json
-from src.session_abc import IxNetworkSession
+from src.bulk_requests_mixin import BulkRequestsMixin
+from src.instrumentation import traced
 
 
-class MainObjectsMixin(IxNetworkSession):
+class MainObjectsMixin(BulkRequestsMixin):
     '''
     This is a mixin class. It only contains specific methods
     and can't be instantiate (due to inheritance from ABC class).
@@ -11,48 +12,66 @@ class MainObjectsMixin(IxNetworkSession):
     virtual ports, topologies, device and network groups
     '''
 
+    @traced
     def assign_ports(self, chassis_ip: str, ports: dict, storage):
         '''
         The method provides chassis selection and ports assignation in purpose
         of setting up IxNetwork configuration.
+
+        Port can be located on other chassis, than "chassis_ip", if its
+        dictionary has "chassis" key. The method returns hrefs of vports.
         '''
-        # Select hardware chassis
+        # Select all hardware chassis by one request
+        chassis_ips = list(dict.fromkeys(
+            [chassis_ip] + [ports[port].get('chassis', chassis_ip) for port in ports]))
         chassis_dict_json = json.dumps(
-            {'hostname': chassis_ip},
+            [{'hostname': ip} for ip in chassis_ips],
             ensure_ascii=True)
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/availableHardware/chassis']),
+                self.api_root, '/availableHardware/chassis']),
             data=chassis_dict_json)
-        self.logger()
+        self.logger(response)
+        # Chassis hrefs are returned in the order of request
+        chassis_hrefs = dict(zip(chassis_ips, storage.save_href([response.text])))
         # Assign ports mentioned in the "ports" dictionary
-        chassis_href = '/api/v1/sessions/1/ixnetwork/availableHardware/chassis/1/'
         ports_dict_json = json.dumps(
             [
                 {
                     'connectedTo': ''.join([
-                        chassis_href, 'card/', ports[port]['card'], '/port/', ports[port]['port']]),
+                        chassis_hrefs[ports[port].get('chassis', chassis_ip)],
+                        '/card/', ports[port]['card'], '/port/', ports[port]['port']]),
                     'name': ports[port]['link_id']
                 }
                 for port in ports
             ],
             ensure_ascii=True)
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/vport']),
+                self.api_root, '/vport']),
             data=ports_dict_json)
         # Save vports hrefs for future usage
-        storage.vports = [self.response.text]
-        self.logger()
+        storage.vports = [response.text]
+        self.logger(response)
+        return storage.vports
 
-    def create_topology(self, storage, existed_vports=None):
+    @traced
+    def create_topology(self, storage, existed_vports=None, bulk: bool=False):
         '''
         The method creates IxNetowrk topology based on previously created ports
+
+        In bulk mode all topologies are created by one list POST request.
         '''
         if not existed_vports:
             existed_vports = storage.vports
+        if bulk:
+            storage.topologies = self.bulk_create(
+                [self.api_root] * len(existed_vports),
+                '/topology',
+                [{'ports': [port_href]} for port_href in existed_vports])
+            return
         cummulative_hrefs = []
         # Create new topology with existed vports
         for port_href in existed_vports:
@@ -62,26 +81,40 @@ class MainObjectsMixin(IxNetworkSession):
                         'ports': [port_href]
                     }
                 ])
-            self.response = self.session.post(
+            response = self.session.post(
                 url=''.join([
                     self.entry_point,
-                    '/api/v1/sessions/1/ixnetwork/topology']),
+                    self.api_root, '/topology']),
                 data=vport_dict_json)
-            cummulative_hrefs.append(self.response.text)
-            self.logger()
+            cummulative_hrefs.append(response.text)
+            self.logger(response)
         # Save topology hrefs for future usage
         storage.topologies = cummulative_hrefs
 
+    @traced
     def create_device_groups(
             self,
             storage,
             existed_topologies=None,
-            multiplier: int=1):
+            multiplier: int=1,
+            bulk: bool=False):
         '''
         The method creates DeviceGroups based on previously created topologies
+
+        In bulk mode DeviceGroups are grouped by topology and created by
+        one list POST request per topology.
         '''
         if not existed_topologies:
             existed_topologies = storage.topologies
+        if bulk:
+            storage.device_groups = self.bulk_create(
+                existed_topologies,
+                '/deviceGroup',
+                [
+                    {'multiplier': multiplier, 'name': topology_href[-1]}
+                    for topology_href in existed_topologies
+                ])
+            return
         cummulative_hrefs = []
         # Create new DeviceGroups for existed topologies
         for topology_href in existed_topologies:
@@ -92,13 +125,13 @@ class MainObjectsMixin(IxNetworkSession):
                         'name': topology_href[-1]
                     }
                 ])
-            self.response = self.session.post(
+            response = self.session.post(
                 url=''.join([
                     self.entry_point,
                     topology_href,
                     '/deviceGroup']),
                 data=devicegroup_dict_json)
-            cummulative_hrefs.append(self.response.text)
-            self.logger()
+            cummulative_hrefs.append(response.text)
+            self.logger(response)
         # Save DeviceGroups hrefs for future usage
         storage.device_groups = cummulative_hrefs
@@ -0,0 +1,133 @@
+import re
+import json
+import logging
+import itertools
+
+
+class RequestLogger():
+    '''
+    This is a concrete class that logs IxNetwork requests and responses.
+
+    Nothing is formatted unless the logging level is enabled. Other
+    options allow to reduce logging cost on hot paths (like statistics
+    polling or bulk creation):
+     * sampling - dictionary {url regex: N}, only each N-th request
+       with matching url is logged
+     * max_body - request and response bodies are truncated to this
+       number of characters
+     * structured - compact single-line JSON records instead of pretty
+       formatted multi-line messages
+    '''
+
+    def __init__(
+            self,
+            name: str='src.ixnetwork_aggregate',
+            level: int=logging.INFO,
+            sampling: dict=None,
+            max_body: int=None,
+            structured: bool=False):
+        self.logger = logging.getLogger(name)
+        self.level = level
+        self.max_body = max_body
+        self.structured = structured
+        self.sampling = [
+            (re.compile(pattern), every, itertools.count())
+            for pattern, every in (sampling or {}).items()]
+
+    def sampled(self, url: str) -> bool:
+        '''
+        The method returns True if request with provided url should be logged
+        '''
+        for pattern, every, counter in self.sampling:
+            if pattern.search(url):
+                return next(counter) % every == 0
+        return True
+
+    def truncate(self, text: str) -> str:
+        if self.max_body is not None and len(text) > self.max_body:
+            return ''.join([
+                text[:self.max_body], f'... ({len(text)} characters)'])
+        return text
+
+    def log(self, response, content: bool=True):
+        '''
+        The method logs request and response. If "content" is False
+        response body is not read (e.g. for streamed responses).
+        '''
+        if not self.logger.isEnabledFor(self.level):
+            return
+        if not self.sampled(response.request.url):
+            return
+        if self.structured:
+            message = self.format_structured(response, content)
+        else:
+            message = self.format_pretty(response, content)
+        self.logger.log(self.level, message)
+
+    def request_body(self, response):
+        body = response.request.body
+        if body is None or isinstance(body, str):
+            return body
+        if isinstance(body, bytes):
+            return body.decode('utf-8', errors='replace')
+        # Uploaded files are not JSON
+        return 'Binary content'
+
+    def response_body(self, response, content: bool):
+        if not content:
+            return 'Binary content'
+        content_type = response.headers.get('Content-Type', '')
+        if 'json' not in content_type and 'text' not in content_type:
+            return 'Binary content'
+        return response.text
+
+    def format_structured(self, response, content: bool) -> str:
+        '''
+        The method returns compact JSON record
+        '''
+        request_body = self.request_body(response)
+        return json.dumps(
+            {
+                'method': response.request.method,
+                'url': response.request.url,
+                'status': response.status_code,
+                'elapsed_ms': round(response.elapsed.total_seconds() * 1000, 3),
+                'request': self.truncate(request_body) if request_body else None,
+                'response': self.truncate(self.response_body(response, content))
+            },
+            separators=(',', ':'))
+
+    def format_pretty(self, response, content: bool) -> str:
+        '''
+        The method returns pretty formatted multi-line message
+        '''
+        body = self.request_body(response)
+        if body is None:
+            body = 'None'
+        else:
+            body = ''.join(['\n', self.truncate(pretty_json(body))])
+        status = ' '.join([
+            str(response.status_code), response.reason])
+        response_json = self.response_body(response, content)
+        if response_json != 'Binary content':
+            response_json = ''.join(['\n', self.truncate(pretty_json(response_json))])
+        fmt_info = (
+            f'\nREQUEST'
+            f'\nURL:     {response.request.url}'
+            f'\nHeaders: {response.request.headers}'
+            f'\nJSON:    {body}'
+            f'\nRESPONSE'
+            f'\nStatus:  {status}'
+            f'\nHeaders: {response.headers}'
+            f'\nJSON:    {response_json}')
+        return fmt_info
+
+
+def pretty_json(text: str) -> str:
+    '''
+    The function returns indented JSON or text as is, if it is not JSON
+    '''
+    try:
+        return json.dumps(json.loads(text), indent=4)
+    except ValueError:
+        return text
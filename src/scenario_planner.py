@@ -0,0 +1,325 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.core_network_mixin import CoreNetworkObjectsMixin
+from src.storage_component import Storage
+from src.certificate_cache import PinnedAdapter
+
+
+class PlanStep():
+    '''
+    This is a concrete class that describes one node of the request DAG:
+    one or several REST requests, that can be sent as soon as all steps
+    from "depends_on" are finished.
+    '''
+
+    __slots__ = (
+        'name', 'action', 'depends_on', 'level',
+        'result', 'started', 'finished')
+
+    def __init__(self, name: str, action, depends_on=()):
+        self.name = name
+        self.action = action
+        self.depends_on = list(depends_on)
+        self.level = 1 + max(
+            [step.level for step in self.depends_on], default=-1)
+        self.result = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def duration(self):
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.name!r}, level={self.level})'
+
+
+class ScenarioPlanner():
+    '''
+    This is a concrete class that compiles declarative scenario
+    specification into the dependency-ordered plan of requests and
+    executes it with IxNetworkRESTAPI session.
+
+    Specification is a dictionary (or YAML document) like this:
+
+        chassis: 192.168.100.1
+        ports:
+          port1/1: {card: '1', port: '1', link_id: left_side}
+          port1/2: {card: '1', port: '2', link_id: right_side}
+        topologies:
+          - port: port1/1
+            device_groups:
+              - name: left
+                multiplier: 10
+                stack: [ethernet, ipv4]
+                addressing: {start: 10.100.0.20, gateway: 10.100.0.10, prefix: 24}
+          - port: port1/2
+            device_groups:
+              - name: right
+                addressing: {start: 10.200.0.20, gateway: 10.200.0.10, prefix: 24}
+        traffic:
+          name: Test
+          endpoints: [left, right]
+
+    "ports" has the same format as in assign_ports(), "addressing" is an
+    entry of set_ipv4_addressing() and "traffic" contains arguments of
+    create_traffic_item() plus DeviceGroup names of destination and source.
+
+    All topologies are created by one list POST and all DeviceGroups of
+    a topology by one list POST. Every DeviceGroup then is an independent
+    branch (Ethernet, IPv4, addressing) that doesn't wait for its siblings.
+    '''
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.steps = []
+        self.branches = {}
+        self.compile()
+
+    @classmethod
+    def from_yaml(cls, path: str):
+        '''
+        The method creates planner from YAML file (requires PyYAML)
+        '''
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError('PyYAML is required for YAML specifications')
+        with open(path, 'r', encoding='utf-8') as spec_file:
+            return cls(yaml.safe_load(spec_file))
+
+    def add_step(self, name: str, action, depends_on=()):
+        step = PlanStep(name, action, depends_on)
+        self.steps.append(step)
+        return step
+
+    def compile(self):
+        '''
+        The method converts specification into the list of plan steps
+        '''
+        ports = self.spec['ports']
+        port_names = list(ports)
+        topologies = self.spec.get('topologies', [])
+        ports_step = self.ports_step = self.add_step(
+            'assign_ports',
+            lambda api, results: api.assign_ports(
+                self.spec['chassis'], ports, Storage()))
+        topologies_step = self.topologies_step = self.add_step(
+            'topologies',
+            lambda api, results: post_children(
+                api,
+                api.api_root,
+                '/topology',
+                [
+                    {'ports': [results[ports_step][
+                        port_names.index(topology['port'])]]}
+                    for topology in topologies
+                ]),
+            [ports_step])
+        addressing_steps = []
+        for topology_index, topology in enumerate(topologies):
+            device_groups = topology.get('device_groups', [{}])
+            device_groups_step = self.add_step(
+                f'topology{topology_index + 1}.device_groups',
+                make_device_groups_action(
+                    topologies_step, topology_index, device_groups),
+                [topologies_step])
+            for group_index, device_group in enumerate(device_groups):
+                branch_name = device_group.get(
+                    'name', f'topology{topology_index + 1}.dg{group_index + 1}')
+                branch = {'device_group': (device_groups_step, group_index)}
+                parent = branch['device_group']
+                for protocol in device_group.get('stack', ['ethernet', 'ipv4']):
+                    protocol_step = self.add_step(
+                        f'{branch_name}.{protocol}',
+                        make_protocol_action(parent, protocol),
+                        [parent[0]])
+                    parent = branch[protocol] = (protocol_step, 0)
+                if 'ipv4' in branch and 'addressing' in device_group:
+                    addressing_steps.append(self.add_step(
+                        f'{branch_name}.addressing',
+                        make_addressing_action(
+                            branch['ipv4'], device_group['addressing']),
+                        [branch['ipv4'][0]]))
+                self.branches[branch_name] = branch
+        if 'traffic' in self.spec:
+            traffic = dict(self.spec['traffic'])
+            endpoints = []
+            for name in traffic.pop('endpoints'):
+                if 'ipv4' not in self.branches.get(name, {}):
+                    raise ValueError(
+                        f'Traffic endpoint "{name}" is not DeviceGroup with ipv4 stack')
+                endpoints.append(self.branches[name]['ipv4'])
+            self.add_step(
+                'traffic_item',
+                lambda api, results: api.create_traffic_item(
+                    hrefs=[results[step][index] for step, index in endpoints],
+                    **traffic),
+                [step for step, _ in endpoints] + addressing_steps)
+
+    def execute(self, api, storage=None, max_workers: int=16):
+        '''
+        The method executes plan. Every step is submitted to the thread
+        pool as soon as its dependencies are finished, so independent
+        branches proceed without waiting for each other.
+
+        It returns dictionary {step: result} and, if storage provided,
+        saves all created hrefs there.
+        '''
+        results = {}
+        waiting = {step: set(step.depends_on) for step in self.steps}
+        dependents = {step: [] for step in self.steps}
+        for step in self.steps:
+            for dependency in step.depends_on:
+                dependents[dependency].append(step)
+        # Each worker gets its own connection to the IxNetwork host,
+        # custom transport adapter is kept as is
+        if api.transport is None:
+            api.mount_adapter(PinnedAdapter(
+                pool_connections=1, pool_maxsize=max_workers))
+
+        def run(step):
+            step.started = time.perf_counter()
+            step.result = step.action(api, results)
+            step.finished = time.perf_counter()
+            return step.result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for step in [step for step in self.steps if not waiting[step]]:
+                futures[executor.submit(run, step)] = step
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = futures.pop(future)
+                    results[step] = future.result()
+                    for dependent in dependents[step]:
+                        waiting[dependent].discard(step)
+                        if not waiting[dependent]:
+                            futures[executor.submit(run, dependent)] = dependent
+        if storage is not None:
+            self.save_to_storage(storage, results)
+        return results
+
+    def save_to_storage(self, storage, results):
+        '''
+        The method saves created hrefs into the Storage in order of the
+        specification
+        '''
+        hrefs = {
+            'vports': results[self.ports_step],
+            'topologies': results[self.topologies_step],
+            'device_groups': [],
+            'ethernets': [],
+            'ipv4': []}
+        for branch in self.branches.values():
+            for protocol, key in [
+                    ('device_group', 'device_groups'),
+                    ('ethernet', 'ethernets'),
+                    ('ipv4', 'ipv4')]:
+                if protocol in branch:
+                    step, index = branch[protocol]
+                    hrefs[key].append(results[step][index])
+        for key, value in hrefs.items():
+            setattr(storage, key, value)
+
+    def critical_path(self):
+        '''
+        The method returns the longest (by measured duration) chain of
+        dependent steps of executed plan and its total duration.
+        '''
+        longest = {}
+        for step in self.steps:
+            previous = max(
+                [longest[dependency] for dependency in step.depends_on],
+                key=lambda chain: chain[0], default=(0.0, []))
+            longest[step] = (previous[0] + step.duration, previous[1] + [step])
+        return max(longest.values(), key=lambda chain: chain[0], default=(0.0, []))
+
+    def report(self) -> str:
+        '''
+        The method returns pretty formatted plan with dependency levels,
+        step durations and critical path.
+        '''
+        lines = ['SCENARIO PLAN']
+        for step in sorted(self.steps, key=lambda step: step.level):
+            lines.append(
+                f'level {step.level:<3} {step.name:<50} {step.duration:>9.3f} s')
+        duration, chain = self.critical_path()
+        lines.append(f'Critical path ({duration:.3f} s):')
+        lines.append(' -> '.join(step.name for step in chain))
+        return '\n'.join(lines)
+
+
+def links_from_response(response):
+    '''
+    The function returns hrefs from IxNetwork response on POST request
+    '''
+    return [link['href'] for link in response.json()['links']]
+
+
+def post_children(api, parent_href: str, child: str, payloads: list):
+    '''
+    The function creates children objects of one parent by one list POST
+    and returns their hrefs. It can be used from several threads.
+    '''
+    response = api.session.post(
+        url=''.join([api.entry_point, parent_href, child]),
+        data=json.dumps(payloads))
+    api.logger(response)
+    return links_from_response(response)
+
+
+def make_device_groups_action(topologies_step, topology_index: int, device_groups: list):
+    '''
+    The function returns plan action, that creates all DeviceGroups
+    of one topology by one request
+    '''
+    def action(api, results):
+        topology_href = results[topologies_step][topology_index]
+        return post_children(
+            api,
+            topology_href,
+            '/deviceGroup',
+            [
+                {
+                    'multiplier': device_group.get('multiplier', 1),
+                    'name': device_group.get('name', topology_href[-1])
+                }
+                for device_group in device_groups
+            ])
+    return action
+
+
+def make_protocol_action(parent, protocol: str):
+    '''
+    The function returns plan action, that creates protocol stack
+    object (ethernet, ipv4) on top of its parent
+    '''
+    parent_step, parent_index = parent
+
+    def action(api, results):
+        return post_children(
+            api, results[parent_step][parent_index], f'/{protocol}', [{}])
+    return action
+
+
+def make_addressing_action(ipv4, addressing):
+    '''
+    The function returns plan action, that sets IPv4 addressing
+    through multivalue patterns (see set_ipv4_addressing())
+    '''
+    ipv4_step, ipv4_index = ipv4
+
+    def action(api, results):
+        ipv4_href = results[ipv4_step][ipv4_index]
+        # Plan always sends requests, so staged (importconfig backend)
+        # version of the method isn't used
+        CoreNetworkObjectsMixin.set_ipv4_addressing(
+            api, None, [addressing], [ipv4_href])
+        return [ipv4_href]
+    return action
@@ -0,0 +1,143 @@
+import json
+import threading
+from time import monotonic
+
+
+class SelectQuery():
+    '''
+    This is a concrete class that builds one entry of IxNetwork
+    /operations/select request. Methods can be chained:
+
+        SelectQuery('/statistics').child('view', ['caption', 'id'])
+
+    Only requested properties are returned by the server, so selects are
+    much lighter than GET of whole objects.
+    '''
+
+    __slots__ = ('_from', '_properties', '_children', '_inlines')
+
+    def __init__(self, from_href: str, properties=()):
+        self._from = from_href
+        self._properties = list(properties)
+        self._children = []
+        self._inlines = []
+
+    def properties(self, *names):
+        '''
+        The method adds properties of the "from" object into the query
+        '''
+        self._properties.extend(names)
+        return self
+
+    def child(self, child: str, properties=('*',), filters=()):
+        '''
+        The method adds children objects into the query. Filters are
+        dictionaries like {'property': 'caption', 'regex': 'Flow.*'}
+        '''
+        self._children.append(
+            {
+                'child': child,
+                'properties': list(properties),
+                'filters': list(filters)
+            })
+        return self
+
+    def inline(self, child: str, properties=('*',)):
+        '''
+        The method adds inline children (returned with their parent)
+        '''
+        self._inlines.append(
+            {
+                'child': child,
+                'properties': list(properties)
+            })
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            'from': self._from,
+            'properties': list(self._properties),
+            'children': list(self._children),
+            'inlines': list(self._inlines)}
+
+    def key(self) -> str:
+        '''
+        The method returns unique key of the query for caching purposes
+        '''
+        return json.dumps(self.to_dict(), sort_keys=True)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self._from!r})'
+
+
+class SelectResult():
+    '''
+    This is a concrete class that wraps one object of select result.
+    Properties are available as attributes or items, children as lists
+    of SelectResult objects.
+    '''
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, name):
+        value = self._data[name]
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            return [SelectResult(entry) for entry in value]
+        return value
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __contains__(self, name):
+        return name in self._data
+
+    def get(self, name, default=None):
+        return self[name] if name in self._data else default
+
+    def children(self, child: str) -> list:
+        '''
+        The method returns list of children results of provided type
+        '''
+        return self[child] if self._data.get(child) else []
+
+    def to_dict(self) -> dict:
+        return self._data
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self._data.get("href")!r})'
+
+
+class SelectCache():
+    '''
+    This is a concrete class that caches select results by query key
+    for "ttl" seconds. It is intended for read-mostly IxNetwork nodes,
+    like statistics views list or availableHardware.
+    '''
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key: str, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (monotonic() + ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
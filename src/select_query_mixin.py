@@ -0,0 +1,106 @@
+import json
+from src.session_abc import IxNetworkSession
+from src.attribute_cache import AttributeCache
+from src.select_query import SelectCache, SelectQuery, SelectResult
+
+
+class SelectQueryMixin(IxNetworkSession):
+    '''
+    This is a mixin class. It only contains specific methods
+    and can't be instantiate (due to inheritance from ABC class).
+
+    This class contains methods for reading IxNetwork objects through
+    /operations/select endpoint with SelectQuery objects.
+    '''
+
+    # Maximum number of objects in the attribute cache
+    ATTRIBUTE_CACHE_SIZE: int = 4096
+
+    @property
+    def select_cache(self):
+        if getattr(self, '_select_cache', None) is None:
+            self._select_cache = SelectCache()
+        return self._select_cache
+
+    @property
+    def attribute_cache(self):
+        if getattr(self, '_attribute_cache', None) is None:
+            self._attribute_cache = AttributeCache(
+                SelectQueryMixin.ATTRIBUTE_CACHE_SIZE)
+        return self._attribute_cache
+
+    @property
+    def view_ids(self) -> dict:
+        '''
+        Statistics views ids {caption: id}, resolved once per config
+        '''
+        if getattr(self, '_view_ids', None) is None:
+            self._view_ids = {}
+        return self._view_ids
+
+    def select(self, *queries, ttl: float=None) -> list:
+        '''
+        The method sends all provided queries by one select request and
+        returns one SelectResult per query.
+
+        If "ttl" is provided, results are cached for "ttl" seconds and
+        identical queries are answered from the cache.
+        '''
+        key = '\n'.join(query.key() for query in queries)
+        if ttl is not None:
+            cached = self.select_cache.get(key)
+            if cached is not None:
+                return cached
+        select_dict_json = json.dumps(
+            {
+                'selects': [query.to_dict() for query in queries]
+            })
+        # Local response, so selects can be done from several threads
+        response = self.session.post(
+            url=''.join([
+                self.entry_point,
+                self.api_root, '/operations/select']),
+            data=select_dict_json)
+        self.logger(response)
+        results = [SelectResult(entry) for entry in response.json()['result']]
+        if ttl is not None:
+            self.select_cache.put(key, results, ttl)
+        return results
+
+    def get_attributes(self, hrefs, attributes) -> list:
+        '''
+        The method returns dictionaries with provided attributes for each
+        object href. Attributes are taken from the attribute cache, only
+        missing objects are fetched (all of them by one select request).
+        Use it only for attributes that never change, like multivalue hrefs.
+        '''
+        found = {}
+        missing = []
+        for href in hrefs:
+            entry = self.attribute_cache.get(href, attributes)
+            if entry is None:
+                missing.append(href)
+            else:
+                found[href] = entry
+        if missing:
+            results = self.select(*[
+                SelectQuery(href, attributes) for href in missing])
+            for href, result in zip(missing, results):
+                entry = {name: result[name] for name in attributes}
+                self.attribute_cache.put(href, entry)
+                found[href] = entry
+        return [found[href] for href in hrefs]
+
+    def invalidate_select_cache(self):
+        '''
+        The method drops all cached select results and statistics views ids
+        '''
+        self.select_cache.clear()
+        self.invalidate_view_ids()
+
+    def invalidate_view_ids(self):
+        '''
+        The method drops cached statistics views ids (views are recreated
+        by IxNetwork on new config and traffic apply)
+        '''
+        self.view_ids.clear()
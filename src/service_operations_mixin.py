@@ -1,8 +1,13 @@
+import os
+import gzip
 import json
-from src.session_abc import IxNetworkSession
+import hashlib
+from src.select_query import SelectQuery
+from src.select_query_mixin import SelectQueryMixin
+from src.instrumentation import traced
 
 
-class ServiceOperationsMixin(IxNetworkSession):
+class ServiceOperationsMixin(SelectQueryMixin):
     '''
     This is a mixin class. It only contains specific methods
     and can't be instantiate (due to inheritance from ABC class).
@@ -12,33 +17,187 @@ class ServiceOperationsMixin(IxNetworkSession):
     '''
 
     IXIA_CONFIG_NAME: str = 'ixia_config.ixncfg'
+    # Size of chunks for streaming download
+    CHUNK_SIZE: int = 1024 * 1024
+    # Local manifest of configs, that have been uploaded to IxNetwork hosts
+    IXIA_MANIFEST_NAME: str = 'ixia_uploads.json'
+    # Children (and their properties) fetched by synchronize_storage(),
+    # each one is listed after its parent node
+    STORAGE_TREE: list = [
+        ('vport', ['name', 'connectedTo']),
+        ('topology', ['name']),
+        ('deviceGroup', ['name', 'multiplier']),
+        ('ethernet', ['name']),
+        ('ipv4', ['name', 'address', 'prefix', 'gatewayIp']),
+        ('traffic', []),
+        ('trafficItem', ['name'])]
 
-    def save_and_download_config(self):
+    @traced
+    def save_and_download_config(
+            self,
+            path: str=None,
+            compression: str=None,
+            chunk_size: int=None) -> str:
         '''
         The method saves IxNetowrk configuration to the file
         and downloads it from IxNetwork to HFTS.
+
+        Config is streamed to the "path" (IXIA_CONFIG_NAME by default)
+        by chunks, so memory usage doesn't depend on config size.
+        Optionally it can be compressed on the fly ('gzip' or 'zstd',
+        the latter requires zstandard package). The method returns
+        SHA-256 hex digest of the (uncompressed) config.
         '''
+        if path is None:
+            path = ServiceOperationsMixin.IXIA_CONFIG_NAME
         # Save configuration
         filename_dict_json = json.dumps(
             {'arg1': ServiceOperationsMixin.IXIA_CONFIG_NAME},
             ensure_ascii=True)
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/operations/saveconfig']),
+                self.api_root, '/operations/saveconfig']),
             data=filename_dict_json)
-        self.logger()
+        self.logger(response)
         # Get config from IxNetwork
-        self.response = self.session.get(
+        with self.session.get(
+                url=''.join([
+                    self.entry_point,
+                    self.api_root, '/files?filename=' +
+                    f'{ServiceOperationsMixin.IXIA_CONFIG_NAME}']),
+                stream=True) as response:
+            self.logger(response, content=False)
+            response.raise_for_status()
+            return stream_to_file(
+                response, path, compression,
+                chunk_size or ServiceOperationsMixin.CHUNK_SIZE)
+
+    @traced
+    def upload_and_load_config(
+            self,
+            path: str,
+            storage=None,
+            manifest_path: str=None) -> str:
+        '''
+        The method uploads local config to the IxNetwork host and loads it.
+
+        Config is stored on the server under the name derived from its
+        SHA-256 digest. Digests of uploaded configs are tracked in the
+        local manifest (per IxNetwork host), so identical config is
+        uploaded only once. If storage is provided, it is rebuilt from the
+        loaded config. The method returns server filename of the config.
+        '''
+        if manifest_path is None:
+            manifest_path = ServiceOperationsMixin.IXIA_MANIFEST_NAME
+        digest = file_digest(path)
+        filename = f'{digest}.ixncfg'
+        manifest = read_manifest(manifest_path)
+        uploaded = manifest.setdefault(self.entry_point, [])
+        skipped = digest in uploaded
+        if not skipped:
+            self.upload_config(path, filename)
+        try:
+            self.load_config(filename)
+        except RuntimeError:
+            if not skipped:
+                raise
+            # Server has lost the file, so manifest is outdated
+            self.upload_config(path, filename)
+            self.load_config(filename)
+        if digest not in uploaded:
+            uploaded.append(digest)
+            write_manifest(manifest_path, manifest)
+        if storage is not None:
+            self.synchronize_storage(storage)
+        return filename
+
+    def upload_config(self, path: str, filename: str):
+        '''
+        The method streams local file to the IxNetwork files endpoint
+        '''
+        with open(path, 'rb') as file:
+            response = self.session.post(
+                url=''.join([
+                    self.entry_point,
+                    self.api_root, f'/files?filename={filename}']),
+                data=file,
+                headers={'Content-Type': 'application/octet-stream'})
+        self.logger(response)
+        response.raise_for_status()
+
+    def load_config(self, filename: str):
+        '''
+        The method loads config file, that already exists on the
+        IxNetwork host, and waits for the operation completion
+        '''
+        filename_dict_json = json.dumps({'arg1': filename}, ensure_ascii=True)
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/files?filename=' +
-                f'{ServiceOperationsMixin.IXIA_CONFIG_NAME}']))
-        self.logger()
-        # Write retrieved config to the file (in bytes)
-        with open(ServiceOperationsMixin.IXIA_CONFIG_NAME, 'wb') as file:
-            file.write(self.response.content)
+                self.api_root, '/operations/loadconfig']),
+            data=filename_dict_json)
+        self.logger(response)
+        self.wait_for_operation(response)
+        # Loaded config has other objects
+        self.invalidate_select_cache()
+        self.attribute_cache.clear()
+
+    def wait_for_operation(self, response, poll_interval: float=0.5):
+        '''
+        The method polls asynchronous IxNetwork operation from the
+        provided response until it is finished
+        '''
+        operation = response.json()
+        while operation.get('state') == 'IN_PROGRESS':
+            self.pause(poll_interval)
+            # Depending on IxNetwork version url is absolute or relative
+            url = operation['url']
+            if not url.startswith('http'):
+                url = ''.join([self.entry_point, url])
+            response = self.session.get(url=url)
+            self.logger(response)
+            operation = response.json()
+        if operation.get('state') not in ('SUCCESS', 'COMPLETED', None):
+            raise RuntimeError(
+                f'IxNetwork operation failed: {operation.get("result")}')
+        return operation
+
+    @traced
+    def synchronize_storage(self, storage):
+        '''
+        The method rebuilds storage from the objects, that already exist
+        in IxNetwork configuration. Whole vport, topology, DeviceGroup,
+        Ethernet and IPv4 tree (with IPv4 multivalue hrefs) and traffic
+        items are fetched by one select request.
+        '''
+        query = SelectQuery(self.api_root)
+        for child, properties in ServiceOperationsMixin.STORAGE_TREE:
+            query.child(child, properties)
+        result, = self.select(query)
+        storage.hydrate(result.to_dict())
+        # Multivalue hrefs are already known, so save them for future usage
+        for node in storage.nodes('ipv4'):
+            self.attribute_cache.put(node.href, {
+                name: node.attributes[name]
+                for name in ['address', 'prefix', 'gatewayIp']
+                if name in node.attributes})
+
+    @traced
+    def delete_objects(self, storage, hrefs: list):
+        '''
+        The method deletes IxNetwork objects, removes them from storage
+        and drops all cached data about them.
+        '''
+        for href in hrefs:
+            response = self.session.delete(
+                url=''.join([self.entry_point, href]))
+            self.logger(response)
+            storage.remove(href)
+            self.attribute_cache.invalidate(href)
+        self.invalidate_select_cache()
 
+    @traced
     def start_all_protocols(self):
         '''
         The method starts all protocols for all topologies in the active
@@ -46,13 +205,14 @@ class ServiceOperationsMixin(IxNetworkSession):
         '''
         # Here we just prepare an empty JSON
         operations_dict_json = json.dumps({})
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/operations/startallprotocols']),
+                self.api_root, '/operations/startallprotocols']),
             data=operations_dict_json)
-        self.logger()
+        self.logger(response)
 
+    @traced
     def stop_all_protocols(self):
         '''
         The method stops all protocols for all topologies in the active
@@ -60,9 +220,70 @@ class ServiceOperationsMixin(IxNetworkSession):
         '''
         # Here we just prepare an empty JSON
         operations_dict_json = json.dumps({})
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/operations/stopallprotocols']),
+                self.api_root, '/operations/stopallprotocols']),
             data=operations_dict_json)
-        self.logger()
+        self.logger(response)
+
+
+def open_compressed(path: str, compression: str=None):
+    '''
+    The function opens file for binary writing with optional
+    on the fly compression
+    '''
+    if compression is None:
+        return open(path, 'wb')
+    if compression == 'gzip':
+        return gzip.open(path, 'wb')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('zstandard package is required for zstd compression')
+        return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'))
+    raise ValueError(f'"{compression}" is not supported compression')
+
+
+def stream_to_file(response, path: str, compression: str, chunk_size: int) -> str:
+    '''
+    The function writes streamed response content to the file by chunks
+    and returns SHA-256 hex digest of the content
+    '''
+    digest = hashlib.sha256()
+    with open_compressed(path, compression) as file:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            digest.update(chunk)
+            file.write(chunk)
+    return digest.hexdigest()
+
+
+def file_digest(path: str, chunk_size: int=ServiceOperationsMixin.CHUNK_SIZE) -> str:
+    '''
+    The function returns SHA-256 hex digest of the file, reading it by chunks
+    '''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(path: str) -> dict:
+    '''
+    The function reads uploads manifest {entry point: [digests]}
+    '''
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def write_manifest(path: str, manifest: dict):
+    '''
+    The function atomically replaces uploads manifest
+    '''
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=4)
+    os.replace(f'{path}.tmp', path)
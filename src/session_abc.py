@@ -35,9 +35,17 @@ class IxNetworkSession(abc.ABC):
         '''
 
     @abc.abstractmethod
-    def logger(self):
+    def logger(self, response):
         '''
         For troubleshooting, debugging and simple for informational purposes
         compatible concrete class should implement some wrapper around logging
         module that can print pretty formated log messaged into stdout.
         '''
+
+    @abc.abstractmethod
+    def pause(self, seconds):
+        '''
+        Concrete class should wait provided time here. All waits (like polling
+        intervals or traffic duration) should be done through this method,
+        so they can be skipped, e.g. when recorded session is replayed.
+        '''
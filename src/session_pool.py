@@ -0,0 +1,166 @@
+import json
+import queue
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+# Aggregate class for each session of the pool
+from src.ixnetwork_aggregate import IxNetworkRESTAPI
+
+
+class SessionPool():
+    '''
+    This is a concrete class that drives several IxNetwork sessions of
+    one API server (e.g. Linux API server) from one process.
+
+    Pool authenticates once, creates "size" new sessions (or leases
+    existing ones with provided session_ids) and makes one IxNetworkRESTAPI
+    instance per session, so each has its own Storage and requests.Session.
+    Scenarios (callables, that get IxNetworkRESTAPI instance) are dispatched
+    across sessions through the thread pool, one scenario per session at
+    the moment. After each scenario session config and Storage are cleared.
+
+    Sessions created by the pool are deleted by close(), if
+    delete_sessions is True. Other keyword arguments are passed to the
+    api_class constructor.
+    '''
+
+    # How long to wait until new session is started (in seconds)
+    START_TIMEOUT = 300
+
+    def __init__(
+            self,
+            rest_host: str,
+            rest_port: str,
+            user: str,
+            password: str,
+            size: int = 2,
+            session_ids: list = None,
+            delete_sessions: bool = False,
+            api_class: type = IxNetworkRESTAPI,
+            **kwargs):
+        self.delete_sessions = delete_sessions
+        self.created_ids = []
+        self.apis = []
+        self._idle = queue.Queue()
+        # Instance that isn't bound to any session, only for authentication
+        # and sessions management
+        self.manager = IxNetworkRESTAPI(
+            rest_host, rest_port, user, password, lazy=True, clear_config=False,
+            certificate_cache=kwargs.get('certificate_cache'))
+        kwargs['certificate_cache'] = self.manager.certificate_cache
+        # Authenticate once, all instances share the api key
+        self.manager.session
+        if session_ids is None:
+            session_ids = [self.create_session() for _ in range(size)]
+        for session_id in session_ids:
+            api = api_class(
+                rest_host, rest_port, user, password,
+                session_id=session_id, api_key=self.manager.api_key, **kwargs)
+            self.apis.append(api)
+            self._idle.put(api)
+
+    def __len__(self):
+        return len(self.apis)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def create_session(self) -> int:
+        '''
+        The method creates new IxNetwork session, starts it if needed
+        and returns its id
+        '''
+        manager = self.manager
+        response = manager.session.post(
+            url=''.join([manager.entry_point, '/api/v1/sessions']),
+            data=json.dumps({'applicationType': 'ixnrest'}))
+        manager.logger(response)
+        session_id = int(response.json()['id'])
+        self.created_ids.append(session_id)
+        session_url = ''.join([manager.entry_point, f'/api/v1/sessions/{session_id}'])
+        response = manager.session.get(url=session_url)
+        manager.logger(response)
+        if response.json().get('state', 'ACTIVE').upper() != 'ACTIVE':
+            response = manager.session.post(
+                url=''.join([session_url, '/operations/start']),
+                data=json.dumps({'arg1': f'/api/v1/sessions/{session_id}'}))
+            manager.logger(response)
+            manager.wait_for_operation(response)
+        return session_id
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        '''
+        The method leases one idle session (waits for it, if all sessions
+        are busy). Leased session is cleared when it is returned back.
+        If the scenario has failed, errors of clearing are only logged,
+        so the original exception is raised.
+        '''
+        api = self._idle.get(timeout=timeout)
+        try:
+            yield api
+        except BaseException:
+            self.release(api, log_errors=True)
+            raise
+        self.release(api)
+
+    def release(self, api, log_errors: bool = False):
+        '''
+        The method clears session config and Storage and returns
+        the session to the idle ones
+        '''
+        try:
+            api.new_config()
+            api.storage.clear()
+        except Exception:
+            if not log_errors:
+                raise
+            logging.getLogger(__name__).exception(
+                'Clearing of IxNetwork session %s has failed', api.session_id)
+        finally:
+            self._idle.put(api)
+
+    def submit(self, executor, scenario, *args, **kwargs):
+        '''
+        The method submits scenario to the executor, scenario is called
+        with leased IxNetworkRESTAPI instance as the first argument
+        '''
+        def run():
+            with self.lease() as api:
+                return scenario(api, *args, **kwargs)
+        return executor.submit(run)
+
+    def run(self, scenarios, return_exceptions: bool = False) -> list:
+        '''
+        The method runs all scenarios concurrently (as many at once as
+        there are sessions) and returns their results in the same order.
+        If return_exceptions is True, exceptions are returned as results,
+        otherwise the first one is raised after all scenarios are finished.
+        '''
+        with ThreadPoolExecutor(max_workers=len(self)) as executor:
+            futures = [self.submit(executor, scenario) for scenario in scenarios]
+        results = []
+        for future in futures:
+            error = future.exception()
+            if error is not None and not return_exceptions:
+                raise error
+            results.append(error if error is not None else future.result())
+        return results
+
+    def close(self):
+        '''
+        The method closes all sessions of the pool and deletes sessions,
+        that were created by the pool (if delete_sessions is True)
+        '''
+        for api in self.apis:
+            api.close_rest_session()
+        manager = self.manager
+        if self.delete_sessions:
+            for session_id in self.created_ids:
+                response = manager.session.delete(
+                    url=''.join([manager.entry_point, f'/api/v1/sessions/{session_id}']))
+                manager.logger(response)
+        manager.close_rest_session()
@@ -0,0 +1,168 @@
+import json
+import time
+import asyncio
+import itertools
+
+
+class StatisticsSample():
+    '''
+    This is a concrete class that holds one timestamped statistics
+    snapshot of the poller. "timestamp" is a wall clock time (seconds
+    since the epoch), "elapsed" is a time since the poller start.
+    '''
+
+    __slots__ = ('index', 'timestamp', 'elapsed', 'statistics')
+
+    def __init__(self, index: int, timestamp: float, elapsed: float, statistics: dict):
+        self.index = index
+        self.timestamp = timestamp
+        self.elapsed = elapsed
+        self.statistics = statistics
+
+    def to_dict(self) -> dict:
+        return {
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'elapsed': self.elapsed,
+            'statistics': self.statistics}
+
+    def __repr__(self):
+        return (
+            f'{type(self).__name__}(index={self.index!r}, '
+            f'elapsed={self.elapsed:.3f})')
+
+
+class StatisticsPoller():
+    '''
+    This is a concrete class that polls flow statistics of the running
+    traffic and yields StatisticsSample objects:
+
+        for sample in StatisticsPoller(session, interval=1, duration=60):
+            print(sample.elapsed, sample.statistics)
+
+    Samples are taken on the fixed schedule (0, interval, 2 * interval, ...
+    and exactly at "duration"), so time spent on requests doesn't shift
+    the next samples; ticks missed because of slow responses are skipped.
+    Polling stops after "duration" or as soon as "until" predicate
+    returns True for a sample. Each sample is passed to all "sinks"
+    (callables, e.g. list.append or JsonLinesSink) before it is yielded.
+
+    The poller is also an asynchronous iterator ("async for"), requests
+    are sent from the default executor then.
+    '''
+
+    def __init__(
+            self,
+            api,
+            interval: float=1.0,
+            duration: float=60,
+            until=None,
+            sinks=()):
+        if interval <= 0:
+            raise ValueError('Polling interval should be positive')
+        self.api = api
+        self.interval = float(interval)
+        self.duration = float(duration)
+        self.until = until
+        self.sinks = list(sinks)
+        self.view_id = None
+
+    def offline(self) -> bool:
+        '''
+        The method returns True if session is replayed, so the poller
+        doesn't wait in real time
+        '''
+        return getattr(self.api.transport, 'offline', False)
+
+    def collect(self, index: int, elapsed: float) -> StatisticsSample:
+        '''
+        The method takes one statistics snapshot and passes it to sinks
+        '''
+        if self.view_id is None:
+            self.view_id = self.api.flow_statistics_view_id()
+        sample = StatisticsSample(
+            index, time.time(), elapsed, self.api.flow_statistics(self.view_id))
+        for sink in self.sinks:
+            sink(sample)
+        return sample
+
+    def finished(self, sample: StatisticsSample) -> bool:
+        return sample.elapsed >= self.duration or (
+            self.until is not None and self.until(sample))
+
+    def next_tick(self, elapsed: float, scheduled: float) -> float:
+        '''
+        The method returns time (since start) of the next sample, that
+        is still ahead of "elapsed" time (drift correction)
+        '''
+        tick = scheduled + self.interval
+        if tick < elapsed:
+            tick = (elapsed // self.interval + 1) * self.interval
+        return min(tick, self.duration)
+
+    def __iter__(self):
+        started = time.monotonic()
+        scheduled = 0.0
+        for index in itertools.count():
+            # Replayed session doesn't wait, so its clock is the schedule
+            elapsed = max(time.monotonic() - started, scheduled)
+            sample = self.collect(index, elapsed)
+            yield sample
+            if self.finished(sample):
+                return
+            elapsed = time.monotonic() - started
+            scheduled = self.next_tick(elapsed, scheduled)
+            self.api.pause(max(0.0, scheduled - elapsed))
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        scheduled = 0.0
+        for index in itertools.count():
+            elapsed = max(loop.time() - started, scheduled)
+            sample = await loop.run_in_executor(None, self.collect, index, elapsed)
+            yield sample
+            if self.finished(sample):
+                return
+            elapsed = loop.time() - started
+            scheduled = self.next_tick(elapsed, scheduled)
+            if not self.offline():
+                await asyncio.sleep(max(0.0, scheduled - elapsed))
+
+
+class JsonLinesSink():
+    '''
+    This is a concrete class that appends samples to the file
+    as JSON lines (one sample per line), so the time series can be
+    processed while traffic is still running.
+    '''
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def __call__(self, sample: StatisticsSample):
+        self.file.write(json.dumps(sample.to_dict()))
+        self.file.write('\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def loss_observed(threshold: float=0.0):
+    '''
+    The function returns "until" predicate, that stops polling when
+    "Loss %" of any direction exceeds the threshold
+    '''
+    def predicate(sample: StatisticsSample) -> bool:
+        return any(
+            float(direction.get('Loss %') or 0) > threshold
+            for direction in sample.statistics.values())
+    return predicate
@@ -0,0 +1,215 @@
+import json
+import math
+import mmap
+import struct
+from collections import deque
+
+
+class RingFile():
+    '''
+    This is a concrete class of on-disk ring buffer of fixed-width binary
+    records: timestamp, elapsed time and one double per column. File size
+    is fixed (header + capacity records), the oldest records are
+    overwritten. File is memory-mapped, so records written by the running
+    recorder can be read at the same time (e.g. from another process):
+
+        ring = RingFile('soak.ring')
+        ring.columns, ring.read()[-10:]
+
+    If columns are provided, new file is created, otherwise existing one
+    is opened for reading.
+    '''
+
+    MAGIC = b'IXNRING1'
+    # magic, header size, record size, capacity, records written
+    HEADER = struct.Struct('<8sIIIQ')
+
+    def __init__(self, path: str, columns: list=None, capacity: int=86400):
+        self.path = path
+        if columns is not None:
+            self.create(list(columns), int(capacity))
+        self.file = open(path, 'rb' if columns is None else 'r+b')
+        self.map = mmap.mmap(
+            self.file.fileno(), 0,
+            access=mmap.ACCESS_READ if columns is None else mmap.ACCESS_WRITE)
+        magic, self.header_size, record_size, self.capacity, _ = (
+            RingFile.HEADER.unpack_from(self.map))
+        if magic != RingFile.MAGIC:
+            raise ValueError(f'"{path}" is not statistics ring file')
+        self.columns = json.loads(
+            self.map[RingFile.HEADER.size:self.header_size].rstrip(b'\0'))
+        self.record = struct.Struct(f'<{2 + len(self.columns)}d')
+        if self.record.size != record_size:
+            raise ValueError(f'"{path}" has unexpected record size')
+
+    def create(self, columns: list, capacity: int):
+        '''
+        The method writes empty ring file (header and zeroed records)
+        '''
+        names = json.dumps(columns).encode('utf-8')
+        # Records are aligned by 8 bytes
+        header_size = -(-(RingFile.HEADER.size + len(names)) // 8) * 8
+        record_size = struct.calcsize(f'<{2 + len(columns)}d')
+        with open(self.path, 'wb') as ring_file:
+            ring_file.write(RingFile.HEADER.pack(
+                RingFile.MAGIC, header_size, record_size, capacity, 0))
+            ring_file.write(names.ljust(header_size - RingFile.HEADER.size, b'\0'))
+            ring_file.truncate(header_size + record_size * capacity)
+
+    @property
+    def written(self) -> int:
+        '''
+        Number of records written since the file creation
+        '''
+        return RingFile.HEADER.unpack_from(self.map)[4]
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def append(self, timestamp: float, elapsed: float, values):
+        written = self.written
+        self.record.pack_into(
+            self.map,
+            self.header_size + self.record.size * (written % self.capacity),
+            timestamp, elapsed, *values)
+        # Counter is updated after the record, so readers never see
+        # a half written last record
+        struct.pack_into('<Q', self.map, RingFile.HEADER.size - 8, written + 1)
+
+    def read(self, last: int=None) -> list:
+        '''
+        The method returns records (tuples of timestamp, elapsed and column
+        values) from the oldest to the newest one, only "last" ones if provided
+        '''
+        written = self.written
+        count = min(written, self.capacity)
+        if last is not None:
+            count = min(count, last)
+        records = []
+        for index in range(written - count, written):
+            records.append(self.record.unpack_from(
+                self.map,
+                self.header_size + self.record.size * (index % self.capacity)))
+        return records
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StatisticsRecorder():
+    '''
+    This is a concrete class that records flow statistics samples of long
+    traffic runs with bounded memory. It is a StatisticsPoller sink:
+
+        with StatisticsRecorder('soak.ring') as recorder:
+            session.traffic_item_macros(
+                duration=86400, interval=1, sinks=[recorder])
+
+    Each sample is appended to the on-disk ring of "capacity" records
+    (see RingFile) and to the in-memory ring of the "memory_size" latest
+    records. Downsampling tiers ((factor, capacity), ...) keep older
+    history in the additional ring files "<path>.x<factor>" with one
+    record per "factor" samples: counters keep the last value, rates
+    and percents are averaged. Memory and disk usage don't depend on the
+    run length.
+    '''
+
+    FIELDS = (
+        'Tx Frames', 'Rx Frames', 'Frames Delta', 'Loss %',
+        'Tx Frame Rate', 'Rx Frame Rate')
+    DIRECTIONS = ('straight_direction', 'backward_direction')
+    # Cumulative fields, that aren't averaged by downsampling
+    COUNTERS = ('Tx Frames', 'Rx Frames', 'Frames Delta')
+
+    def __init__(
+            self,
+            path: str,
+            fields=FIELDS,
+            directions=DIRECTIONS,
+            capacity: int=86400,
+            memory_size: int=600,
+            tiers=((60, 10080), (3600, 8760))):
+        self.path = path
+        self.keys = [(direction, field) for direction in directions for field in fields]
+        self.columns = [f'{direction}.{field}' for direction, field in self.keys]
+        self.averaged = [field not in StatisticsRecorder.COUNTERS for _, field in self.keys]
+        self.memory = deque(maxlen=memory_size)
+        self.ring = RingFile(path, self.columns, capacity)
+        # [factor, ring, accumulated samples, sums]
+        self.tiers = [
+            [factor, RingFile(f'{path}.x{factor}', self.columns, tier_capacity), 0, None]
+            for factor, tier_capacity in tiers]
+
+    def __call__(self, sample):
+        values = [
+            parse_value(sample.statistics.get(direction, {}).get(field))
+            for direction, field in self.keys]
+        self.append(sample.timestamp, sample.elapsed, values)
+
+    def append(self, timestamp: float, elapsed: float, values: list):
+        self.memory.append((timestamp, elapsed, *values))
+        self.ring.append(timestamp, elapsed, values)
+        for tier in self.tiers:
+            factor, ring, accumulated, sums = tier
+            if sums is None:
+                sums = [0.0] * len(values)
+            sums = [
+                total + value if averaged else value
+                for total, value, averaged in zip(sums, values, self.averaged)]
+            accumulated += 1
+            if accumulated == factor:
+                ring.append(timestamp, elapsed, [
+                    total / factor if averaged else total
+                    for total, averaged in zip(sums, self.averaged)])
+                accumulated, sums = 0, None
+            tier[2:] = [accumulated, sums]
+
+    def recent(self) -> list:
+        '''
+        The method returns the latest records from the memory
+        '''
+        return list(self.memory)
+
+    def history(self, factor: int=1, last: int=None) -> list:
+        '''
+        The method returns records of the raw ring (factor 1) or of the
+        downsampling tier with provided factor
+        '''
+        if factor == 1:
+            return self.ring.read(last)
+        for tier_factor, ring, _, _ in self.tiers:
+            if tier_factor == factor:
+                return ring.read(last)
+        raise KeyError(f'There is no downsampling tier with factor {factor}')
+
+    def paths(self) -> list:
+        return [self.path] + [ring.path for _, ring, _, _ in self.tiers]
+
+    def close(self):
+        self.ring.close()
+        for _, ring, _, _ in self.tiers:
+            ring.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_value(value) -> float:
+    '''
+    The function converts statistics value (string) into float, missing
+    and non-numeric values are NaN
+    '''
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
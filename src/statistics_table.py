@@ -0,0 +1,147 @@
+import math
+from array import array
+
+
+class StatisticsTable():
+    '''
+    This is a concrete class that keeps rows of IxNetwork statistics view
+    in columnar form: one typed array per column. Values are parsed only
+    once, when rows are appended. Column type is guessed from its first
+    value: integers (array 'q'), floats (array 'd') or strings (list).
+    Integer column is promoted to float one if non-integer (or larger than
+    int64) value comes, numeric column becomes string one (with the source
+    values) if non-numeric value comes. Empty markers (EMPTY_VALUES) are NaN in
+    numeric columns and don't define type of the column.
+
+        table = session.statistics_table('Flow Statistics')
+        table['Loss %'], table.row(0), table.to_pandas()
+    '''
+
+    # Values, that mean absence of the value
+    EMPTY_VALUES = ('', 'N/A')
+
+    def __init__(self, captions: list):
+        self.captions = list(captions)
+        self.columns = {caption: None for caption in self.captions}
+        # Leading empty markers of columns, that have no type yet
+        self.pending = {caption: [] for caption in self.captions}
+        # Source values of numeric columns, while they can become string ones
+        self.raw = {}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, caption: str):
+        column = self.columns[caption]
+        return list(self.pending[caption]) if column is None else column
+
+    def __iter__(self):
+        return iter(self.captions)
+
+    def __repr__(self):
+        return f'{type(self).__name__}(columns={len(self.captions)}, rows={self.size})'
+
+    def append(self, row):
+        '''
+        The method appends one row (list of values in order of captions)
+        '''
+        for caption, value in zip(self.captions, row):
+            column = self.columns[caption]
+            empty = value in StatisticsTable.EMPTY_VALUES
+            if column is None:
+                if empty:
+                    self.pending[caption].append(value)
+                    continue
+                column = self.columns[caption] = new_column(value)
+                if isinstance(column, list):
+                    column.extend(self.pending[caption])
+                else:
+                    self.raw[caption] = list(self.pending[caption])
+                    if column.typecode == 'q' and self.pending[caption]:
+                        column = self.columns[caption] = array('d')
+                    column.extend([math.nan] * len(self.pending[caption]))
+                self.pending[caption] = []
+            if isinstance(column, list):
+                column.append(value)
+                continue
+            self.raw[caption].append(value)
+            if empty:
+                if column.typecode == 'q':
+                    column = self.columns[caption] = array('d', column)
+                column.append(math.nan)
+                continue
+            try:
+                if column.typecode == 'q':
+                    try:
+                        column.append(int(value))
+                    except (ValueError, OverflowError):
+                        float(value)
+                        column = self.columns[caption] = array('d', column)
+                        column.append(float(value))
+                else:
+                    column.append(float(value))
+            except ValueError:
+                # Source values are kept as is
+                self.columns[caption] = self.raw.pop(caption)
+        self.size += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+    def row(self, index: int) -> dict:
+        '''
+        The method returns one row as dictionary {caption: value}
+        '''
+        return {caption: self[caption][index] for caption in self.captions}
+
+    def to_dict(self) -> dict:
+        return {caption: list(self[caption]) for caption in self.captions}
+
+    def to_numpy(self) -> dict:
+        '''
+        The method returns dictionary {caption: numpy array} with copies
+        of the columns (requires numpy)
+        '''
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError('numpy package is required for NumPy export')
+        arrays = {}
+        for caption in self.captions:
+            column = self[caption]
+            if isinstance(column, array):
+                arrays[caption] = numpy.array(
+                    column, dtype='int64' if column.typecode == 'q' else 'float64')
+            else:
+                arrays[caption] = numpy.array(column, dtype=object)
+        return arrays
+
+    def to_pandas(self):
+        '''
+        The method returns pandas DataFrame with the table (requires pandas)
+        '''
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError('pandas package is required for pandas export')
+        return pandas.DataFrame(self.to_numpy(), columns=self.captions)
+
+
+def new_column(value: str):
+    '''
+    The function returns empty column of the type, that fits the value
+    '''
+    try:
+        int(value)
+        return array('q')
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return array('d')
+    except ValueError:
+        return []
+
@@ -1,76 +1,308 @@
+import re
 import json
 from pprint import pformat
 
 
+class StorageNode():
+    '''
+    This is a concrete class for one IxNetwork resource inside Storage.
+
+    Each node knows its parent and keeps its children grouped by object
+    type, so navigation in both directions doesn't require any scanning.
+    '''
+
+    __slots__ = ('href', 'object_type', 'parent', 'children', 'attributes')
+
+    def __init__(self, href: str, object_type: str, parent=None):
+        self.href = href
+        self.object_type = object_type
+        self.parent = parent
+        # {object type: {href: node}}, dictionaries keep creation order
+        self.children = {}
+        # Structural attributes of the resource, like multivalue hrefs
+        self.attributes = {}
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.href!r})'
+
+
 class Storage():
     '''
     This is a concrete class that should be used like a storage for existing
     IxNetwork resources, like vports, topologies,devices groups and interfaces.
+
+    Resources are kept in the tree of StorageNode objects (one tree per
+    IxNetwork session root) with two indexes: by href and by object type.
+    So lookup of resource by href, children of resource by their type and
+    all resources of one type are O(1) operations.
     '''
 
-    # Class-level private attributes, listed in Storage.__dict__
-    __vports = []
-    __topologies = []
-    __device_groups = []
-    __ethernets = []
-    __ipv4 = []
+    # Public attributes of Storage and corresponding IxNetwork object types
+    OBJECT_TYPES = {
+        'vports': 'vport',
+        'topologies': 'topology',
+        'device_groups': 'deviceGroup',
+        'ethernets': 'ethernet',
+        'ipv4': 'ipv4',
+        'traffic_items': 'trafficItem'}
+
+    ROOT_PATTERN = re.compile(r'^(/api/v1/sessions/\d+/ixnetwork)(/.*)?$')
+
+    # Only these instance-level attributes are allowed
+    __slots__ = ('_roots', '_nodes', '_types')
+
+    def __init__(self):
+        # {session root href: root node}
+        self._roots = {}
+        # {href: node}
+        self._nodes = {}
+        # {object type: {href: node}}
+        self._types = {}
 
     # This attributes is part of interface of Storage class
-    # (protected instance-level attributes)
     @property
     def vports(self):
-        return self._vports
+        return self.hrefs('vport')
+
+    @vports.setter
+    def vports(self, value):
+        self.replace('vport', value)
 
     @property
     def topologies(self):
-        return self._topologies
+        return self.hrefs('topology')
+
+    @topologies.setter
+    def topologies(self, value):
+        self.replace('topology', value)
 
     @property
     def device_groups(self):
-        return self._device_groups
+        return self.hrefs('deviceGroup')
+
+    @device_groups.setter
+    def device_groups(self, value):
+        self.replace('deviceGroup', value)
 
     @property
     def ethernets(self):
-        return self._ethernets
+        return self.hrefs('ethernet')
+
+    @ethernets.setter
+    def ethernets(self, value):
+        self.replace('ethernet', value)
 
     @property
     def ipv4(self):
-        return self._ipv4
+        return self.hrefs('ipv4')
+
+    @ipv4.setter
+    def ipv4(self, value):
+        self.replace('ipv4', value)
+
+    @property
+    def traffic_items(self):
+        return self.hrefs('trafficItem')
+
+    @traffic_items.setter
+    def traffic_items(self, value):
+        self.replace('trafficItem', value)
+
+    def hrefs(self, object_type: str) -> list:
+        '''
+        The method returns hrefs of all resources of provided type
+        in order of their creation
+        '''
+        return list(self._types.get(object_type, {}))
+
+    def nodes(self, object_type: str) -> list:
+        '''
+        The method returns all nodes of provided type
+        '''
+        return list(self._types.get(object_type, {}).values())
 
-    def __setattr__(self, name, value):
+    def get(self, href: str):
         '''
-        We can set only those attributes, that were defined
-        like class private above (but we are create them like protected,
-        instance-level attributes)
+        The method returns node for provided href or None
         '''
-        if f'_{type(self).__name__}__{name}' in eval(
-                f'{type(self).__name__}.__dict__'):
-            # Using __setattr__ from object()
-            super().__setattr__(f'_{name}', self.save_href(value))
+        return self._nodes.get(href)
+
+    def __contains__(self, href):
+        return href in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def children(self, href: str, object_type: str) -> list:
+        '''
+        The method returns direct children of provided type
+        for the resource with provided href
+        '''
+        node = self._nodes.get(href)
+        if node is None:
+            return []
+        return list(node.children.get(object_type, {}).values())
+
+    def descendants(self, href: str, object_type: str) -> list:
+        '''
+        The method returns all resources of provided type inside the
+        resource with provided href, e.g. all IPv4 under topology 3
+        '''
+        node = self._nodes.get(href)
+        found = []
+        stack = [node] if node is not None else []
+        # Depth-first walk in creation order
+        while stack:
+            current = stack.pop()
+            if current is not node and current.object_type == object_type:
+                found.append(current)
+            for children in reversed(list(current.children.values())):
+                stack.extend(reversed(list(children.values())))
+        return found
+
+    @staticmethod
+    def is_resource(href: str) -> bool:
+        '''
+        The method returns True if href points to the session root or to
+        the resource with id (not to the singleton node, like /traffic)
+        '''
+        match = Storage.ROOT_PATTERN.match(href)
+        return match is not None and (
+            match.group(2) is None or href.rstrip('/').split('/')[-1].isdigit())
+
+    def add(self, href: str, attributes: dict=None):
+        '''
+        The method adds resource (and all its missing parents) to the
+        Storage and returns its node
+        '''
+        node = self._nodes.get(href)
+        if node is None:
+            if not Storage.is_resource(href):
+                raise ValueError(f'"{href}" is not IxNetwork resource href')
+            root_href, path = Storage.ROOT_PATTERN.match(href).groups()
+            node = self._roots.get(root_href)
+            if node is None:
+                node = self._roots[root_href] = StorageNode(root_href, 'ixnetwork')
+            # Path looks like /topology/1/deviceGroup/2, singleton nodes
+            # without id (like /traffic) are parts of their children hrefs
+            parts = (path or '').strip('/').split('/')
+            prefix = node.href
+            index = 0
+            while index < len(parts) - 1:
+                if not parts[index + 1].isdigit():
+                    prefix = '/'.join([prefix, parts[index]])
+                    index += 1
+                    continue
+                child_href = '/'.join([prefix, parts[index], parts[index + 1]])
+                child = self._nodes.get(child_href)
+                if child is None:
+                    child = StorageNode(child_href, parts[index], node)
+                    node.children.setdefault(parts[index], {})[child_href] = child
+                    self._nodes[child_href] = child
+                    self._types.setdefault(parts[index], {})[child_href] = child
+                node = child
+                prefix = child_href
+                index += 2
+        elif node.parent is not None:
+            # Resource could be unlisted from its type by replace()
+            self._types.setdefault(node.object_type, {}).setdefault(href, node)
+        if attributes:
+            node.attributes.update(attributes)
+        return node
+
+    def remove(self, href: str):
+        '''
+        The method removes resource with all its children from the Storage
+        (session root href removes the whole session tree)
+        '''
+        node = self._nodes.get(href) or self._roots.get(href)
+        if node is None:
+            return
+        if node.parent is None:
+            self._roots.pop(href)
         else:
-            raise AttributeError(f'"{name}" is not allowed attribute',)
+            node.parent.children[node.object_type].pop(href)
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._nodes.pop(current.href, None)
+            self._types.get(current.object_type, {}).pop(current.href, None)
+            for children in current.children.values():
+                stack.extend(children.values())
+
+    def clear(self):
+        '''
+        The method removes all resources from the Storage
+        '''
+        self._roots.clear()
+        self._nodes.clear()
+        self._types.clear()
+
+    def replace(self, object_type: str, value):
+        '''
+        The method replaces list of resources of provided type by resources
+        from "value" (see save_href()), like independent list of hrefs.
+        Resources, that aren't in "value", are only unlisted: they and
+        their children stay in the Storage (use remove() to delete resource
+        with all its children).
+        '''
+        hrefs = self.save_href(value)
+        nodes = [self.add(href) for href in hrefs]
+        for node in nodes:
+            if node.object_type != object_type:
+                raise ValueError(f'"{node.href}" is not {object_type} href')
+        # Resources of this type should be listed in provided order
+        self._types[object_type] = {node.href: node for node in nodes}
+
+    def hydrate(self, select_result: dict, clear: bool=True):
+        '''
+        The method rebuilds Storage from the result of IxNetwork
+        /operations/select request (one entry of its "result" list).
+        Every nested object with href becomes a node, its scalar
+        properties (e.g. multivalue hrefs) become node attributes.
+        '''
+        if clear:
+            self.clear()
+        stack = [select_result]
+        while stack:
+            entry = stack.pop()
+            attributes = {}
+            children = []
+            for key, value in entry.items():
+                if isinstance(value, list) and value and isinstance(value[0], dict):
+                    children.extend(value)
+                elif key != 'href':
+                    attributes[key] = value
+            if Storage.is_resource(entry.get('href', '')):
+                self.add(entry['href'], attributes)
+            # Keep creation order of siblings
+            stack.extend(reversed(children))
+        return self
 
     @staticmethod
     def save_href(value):
         '''
         The method gets hrefs (full api paths) to the IxNetwork resource
-        from server response
+        from server responses. Entries can be response texts (or already
+        decoded responses) with "links", or plain hrefs.
         '''
+        hrefs = []
         try:
-            hrefs = [
-                resource['href']
-                for entry in value
-                for resource in json.loads(entry)['links']]
+            for entry in value:
+                if isinstance(entry, str) and entry.startswith('/'):
+                    hrefs.append(entry)
+                    continue
+                if isinstance(entry, (str, bytes)):
+                    entry = json.loads(entry)
+                hrefs.extend(resource['href'] for resource in entry['links'])
         except Exception:
             raise TypeError(f'"{value}" is not properly formated JSON')
         return hrefs
 
     def __repr__(self):
-        # Rename key in self.__dict__ so
-        # it will be type(self).__name__.__dict__
-        renamed_dict = {
-            f'{self.__class__}.{key[1:]}': self.__dict__[key]
-            for key in self.__dict__}
-        # Pretty formatting renamed_dict
-        representation = pformat(renamed_dict)
+        # Keys look like <class 'Storage'>.vports
+        representation = pformat({
+            f'{self.__class__}.{name}': self.hrefs(object_type)
+            for name, object_type in Storage.OBJECT_TYPES.items()
+            if object_type in self._types})
         return representation
@@ -0,0 +1,635 @@
+import os
+import re
+import ssl
+import json
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from time import sleep, monotonic
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubSession():
+    '''
+    This is a concrete class with in-memory state of one IxNetwork
+    session: tree of configuration objects, multivalues, files and
+    synthetic statistics.
+    '''
+
+    # Objects, that are created with multivalue attributes
+    MULTIVALUES = {
+        'ipv4': ['address', 'prefix', 'gatewayIp'],
+        'ethernet': ['mac'],
+        'deviceGroup': []}
+
+    FLOW_COLUMNS = [
+        'Tx Port', 'Rx Port', 'Traffic Item', 'Tx Frames', 'Rx Frames',
+        'Frames Delta', 'Loss %', 'Tx Frame Rate', 'Rx Frame Rate']
+    # Columns of statistics views by their captions
+    VIEW_COLUMNS = {
+        'Port Statistics': [
+            'Stat Name', 'Port Name', 'Line Speed', 'Link State', 'Frames Tx.',
+            'Valid Frames Rx.', 'Frames Tx. Rate', 'Valid Frames Rx. Rate'],
+        'Flow Statistics': FLOW_COLUMNS,
+        'Traffic Item Statistics': [
+            'Traffic Item', 'Tx Frames', 'Rx Frames', 'Frames Delta', 'Loss %',
+            'Tx Frame Rate', 'Rx Frame Rate']}
+
+    def __init__(self, session_id: int, frame_rate: float=1000000.0, loss: float=0.0):
+        self.session_id = session_id
+        self.root = f'/api/v1/sessions/{session_id}/ixnetwork'
+        self.frame_rate = frame_rate
+        self.loss = loss
+        self.files = {}
+        self.newconfig()
+
+    def newconfig(self):
+        # {href: attributes}
+        self.objects = {self.root: {}}
+        # {href: {child type: [child hrefs]}}
+        self.children = {self.root: {}}
+        self.next_ids = {}
+        self.traffic_started = None
+        self.traffic_elapsed = 0.0
+        self.create(f'{self.root}/traffic', {}, singleton=True)
+        self.create(f'{self.root}/resourceManager', {}, singleton=True)
+        self.create(f'{self.root}/availableHardware', {}, singleton=True)
+        statistics = self.create(f'{self.root}/statistics', {}, singleton=True)
+        for caption in ['Port Statistics', 'Flow Statistics', 'Traffic Item Statistics']:
+            view = self.add_child(statistics, 'view', {
+                'caption': caption,
+                'csvFileName': f'{caption}.csv',
+                'type': 'layer23TrafficFlow'})
+            self.create(f'{view}/data', {'pageSize': 50, 'currentPage': 1}, singleton=True)
+
+    # Configuration tree
+    def create(self, href: str, attributes: dict, singleton: bool=False) -> str:
+        '''
+        The method creates object with provided href (and all its
+        missing parents)
+        '''
+        parent, object_type = self.parent_of(href)
+        if parent not in self.objects:
+            self.create(parent, {}, singleton=not parent.split('/')[-1].isdigit())
+        if href not in self.objects:
+            self.objects[href] = {}
+            self.children[href] = {}
+            self.children[parent].setdefault(object_type, []).append(href)
+            if not singleton:
+                object_id = int(href.split('/')[-1])
+                key = (parent, object_type)
+                self.next_ids[key] = max(self.next_ids.get(key, 0), object_id)
+            self.on_create(href, object_type)
+        self.objects[href].update(attributes)
+        return href
+
+    def add_child(self, parent: str, object_type: str, attributes: dict) -> str:
+        key = (parent, object_type)
+        self.next_ids[key] = self.next_ids.get(key, 0) + 1
+        return self.create(f'{parent}/{object_type}/{self.next_ids[key]}', attributes)
+
+    def on_create(self, href: str, object_type: str):
+        '''
+        The method creates implicit children of the new object
+        '''
+        for attribute in StubSession.MULTIVALUES.get(object_type, []):
+            multivalue = self.add_child(self.root, 'multivalue', {'source': href})
+            self.objects[href][attribute] = multivalue
+        if object_type == 'trafficItem':
+            self.create(f'{href}/configElement/1', {})
+            for child in ['frameRate', 'frameSize', 'transmissionDistribution']:
+                self.create(f'{href}/configElement/1/{child}', {}, singleton=True)
+
+    @staticmethod
+    def parent_of(href: str):
+        parts = href.rstrip('/').split('/')
+        if parts[-1].isdigit():
+            return '/'.join(parts[:-2]), parts[-2]
+        return '/'.join(parts[:-1]), parts[-1]
+
+    def delete(self, href: str):
+        parent, object_type = self.parent_of(href)
+        siblings = self.children.get(parent, {}).get(object_type, [])
+        if href in siblings:
+            siblings.remove(href)
+        stack = [href]
+        while stack:
+            current = stack.pop()
+            self.objects.pop(current, None)
+            for hrefs in self.children.pop(current, {}).values():
+                stack.extend(hrefs)
+
+    def absolute(self, href: str) -> str:
+        '''
+        The method converts session relative href (like /statistics)
+        into the absolute one
+        '''
+        if href.startswith('/api/'):
+            return href.rstrip('/')
+        return ''.join([self.root, href]).rstrip('/')
+
+    def to_json(self, href: str) -> dict:
+        object_id = href.split('/')[-1]
+        entry = {'href': href}
+        if object_id.isdigit():
+            entry['id'] = int(object_id)
+        entry.update(self.objects[href])
+        if href.endswith('/data') and '/statistics/view/' in href:
+            entry.update(self.view_data(href))
+        return entry
+
+    # Select
+    def select(self, query: dict) -> dict:
+        href = self.absolute(query['from'])
+        if href not in self.objects:
+            raise KeyError(href)
+        return self.select_node(
+            href, query.get('properties', []), query.get('children', []))
+
+    def select_node(self, href: str, properties: list, children: list) -> dict:
+        entry = self.to_json(href)
+        if '*' not in properties:
+            entry = {
+                name: value for name, value in entry.items()
+                if name in properties or name == 'href'}
+        for child_type, hrefs in self.children.get(href, {}).items():
+            for spec in children:
+                if spec['child'] == child_type:
+                    entry[child_type] = [
+                        self.select_node(child, spec.get('properties', []), children)
+                        for child in hrefs
+                        if self.matches(child, spec.get('filters', []))]
+                    break
+        return entry
+
+    def matches(self, href: str, filters: list) -> bool:
+        entry = self.to_json(href)
+        return all(
+            re.search(entry_filter['regex'], str(entry.get(entry_filter['property'], '')))
+            for entry_filter in filters)
+
+    # Import config
+    def import_config(self, entries: list):
+        for entry in entries:
+            entry = dict(entry)
+            xpath = entry.pop('xpath')
+            match = re.match(r"^/multivalue\[@source = '(.+) (\w+)'\]/(\w+)$", xpath)
+            if match:
+                source, attribute, pattern = match.groups()
+                multivalue = self.objects[self.xpath_to_href(source)][attribute]
+                self.objects[multivalue].update(pattern=pattern, **{pattern: entry})
+                continue
+            for name, value in entry.items():
+                if isinstance(value, list):
+                    entry[name] = [
+                        self.xpath_to_href(item) if isinstance(item, str) and item.startswith('/')
+                        else item for item in value]
+            href = self.xpath_to_href(xpath)
+            self.create(href, entry, singleton=not href.split('/')[-1].isdigit())
+
+    def xpath_to_href(self, xpath: str) -> str:
+        return ''.join([self.root, re.sub(r'/(\w+)\[(\d+)\]', r'/\1/\2', xpath)])
+
+    # Statistics
+    def traffic_items(self) -> list:
+        return self.children[f'{self.root}/traffic'].get('trafficItem', [])
+
+    def elapsed(self) -> float:
+        if self.traffic_started is None:
+            return self.traffic_elapsed
+        return self.traffic_elapsed + monotonic() - self.traffic_started
+
+    def flows(self) -> list:
+        '''
+        The method returns synthetic counters of all flows (one per
+        traffic item direction)
+        '''
+        elapsed = self.elapsed()
+        running = self.traffic_started is not None
+        tx_frames = int(elapsed * self.frame_rate)
+        rx_frames = int(tx_frames * (1.0 - self.loss))
+        rate = self.frame_rate if running else 0.0
+        flows = []
+        for index, item in enumerate(self.traffic_items()):
+            name = self.objects[item].get('name', f'Traffic Item {index + 1}')
+            directions = [('left_side', 'right_side')]
+            if self.objects[item].get('biDirectional'):
+                directions.append(('right_side', 'left_side'))
+            for tx_port, rx_port in directions:
+                flows.append({
+                    'Tx Port': tx_port,
+                    'Rx Port': rx_port,
+                    'Traffic Item': name,
+                    'Tx Frames': tx_frames,
+                    'Rx Frames': rx_frames,
+                    'Tx Frame Rate': rate,
+                    'Rx Frame Rate': rate * (1.0 - self.loss)})
+        return flows
+
+    def view_rows(self, caption: str) -> list:
+        '''
+        The method returns rows of the view (lists of strings in order
+        of the view columns, see VIEW_COLUMNS)
+        '''
+        flows = self.flows()
+        if caption == 'Port Statistics':
+            rows = []
+            for vport in self.children[self.root].get('vport', []):
+                name = self.objects[vport].get('name', vport.split('/')[-1])
+                tx = [flow for flow in flows if flow['Tx Port'] == name]
+                rx = [flow for flow in flows if flow['Rx Port'] == name]
+                rows.append([
+                    self.objects[vport].get('connectedTo', ''), name,
+                    '100GE LAN', 'Link Up',
+                    str(sum(flow['Tx Frames'] for flow in tx)),
+                    str(sum(flow['Rx Frames'] for flow in rx)),
+                    f'{sum(flow["Tx Frame Rate"] for flow in tx):.3f}',
+                    f'{sum(flow["Rx Frame Rate"] for flow in rx):.3f}'])
+            return rows
+        if caption == 'Traffic Item Statistics':
+            items = {}
+            for flow in flows:
+                item = items.setdefault(flow['Traffic Item'], dict.fromkeys(
+                    ['Tx Frames', 'Rx Frames', 'Tx Frame Rate', 'Rx Frame Rate'], 0))
+                for column in item:
+                    item[column] += flow[column]
+            flows = [dict(values, **{'Traffic Item': name}) for name, values in items.items()]
+        rows = []
+        for flow in flows:
+            values = dict(
+                flow,
+                **{
+                    'Tx Frames': str(flow['Tx Frames']),
+                    'Rx Frames': str(flow['Rx Frames']),
+                    'Frames Delta': str(flow['Tx Frames'] - flow['Rx Frames']),
+                    'Loss %': f'{self.loss * 100:.3f}',
+                    'Tx Frame Rate': f'{flow["Tx Frame Rate"]:.3f}',
+                    'Rx Frame Rate': f'{flow["Rx Frame Rate"]:.3f}'})
+            rows.append([values[column] for column in StubSession.VIEW_COLUMNS[caption]])
+        return rows
+
+    def view_data(self, href: str) -> dict:
+        view = href[:-len('/data')]
+        data = self.objects[href]
+        caption = self.objects[view]['caption']
+        rows = self.view_rows(caption)
+        page_size = int(data.get('pageSize', 50))
+        total_pages = max(1, -(-len(rows) // page_size))
+        current_page = min(int(data.get('currentPage', 1)), total_pages)
+        page = rows[(current_page - 1) * page_size:current_page * page_size]
+        return {
+            'columnCaptions': list(StubSession.VIEW_COLUMNS[caption]),
+            'pageValues': [[row] for row in page],
+            'totalPages': total_pages,
+            'currentPage': current_page,
+            'pageSize': page_size,
+            'totalRows': len(rows),
+            'isReady': True}
+
+    def view_csv(self, caption: str) -> bytes:
+        lines = [','.join(StubSession.VIEW_COLUMNS[caption])]
+        lines.extend(','.join(row) for row in self.view_rows(caption))
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    # Operations
+    def operation(self, href: str, name: str, body):
+        '''
+        The method executes operation and returns its result
+        '''
+        arguments = body if isinstance(body, dict) else {}
+        if name == 'newconfig':
+            self.newconfig()
+        elif name == 'start' and href.endswith('/traffic'):
+            if self.traffic_started is None:
+                self.traffic_started = monotonic()
+        elif name == 'stop' and href.endswith('/traffic'):
+            self.traffic_elapsed = self.elapsed()
+            self.traffic_started = None
+        elif name == 'apply' and href.endswith('/traffic'):
+            self.traffic_elapsed = 0.0
+        elif name == 'saveconfig':
+            self.files[arguments['arg1']] = self.dump()
+        elif name == 'loadconfig':
+            if arguments['arg1'] not in self.files:
+                return 'ERROR', f'File {arguments["arg1"]} is not found'
+            self.load(self.files[arguments['arg1']])
+        elif name == 'importconfig':
+            self.import_config(json.loads(arguments['arg2']))
+        elif name == 'takeviewcsvsnapshot':
+            settings = dict(
+                setting.split(': ', 1) for setting in arguments.get('arg2', []))
+            location = settings['Snapshot.View.Csv.Location']
+            for caption in arguments.get('arg1', []):
+                self.files[f'{location}/{caption}.csv'] = self.view_csv(caption)
+        return 'SUCCESS', None
+
+    def dump(self) -> bytes:
+        return json.dumps({
+            'objects': self.objects,
+            'children': self.children,
+            'next_ids': [[parent, object_type, value]
+                         for (parent, object_type), value in self.next_ids.items()]
+        }).encode('utf-8')
+
+    def load(self, content: bytes):
+        state = json.loads(content.decode('utf-8'))
+        self.objects = state['objects']
+        self.children = state['children']
+        self.next_ids = {
+            (parent, object_type): value
+            for parent, object_type, value in state['next_ids']}
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    '''
+    This is a concrete class that dispatches HTTP requests of IxNetwork
+    REST API to the StubSession objects of the server.
+    '''
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, so Nagle's algorithm
+    # would add delayed ACK to every keep-alive request
+    disable_nagle_algorithm = True
+
+    SESSION_PATTERN = re.compile(r'^/api/v1/sessions/(\d+)(/.*)?$')
+
+    def log_message(self, format, *args):
+        # Stub should be silent
+        pass
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_PATCH(self):
+        self.dispatch('PATCH')
+
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length', 0) or 0)
+        content = self.rfile.read(length) if length else b''
+        if 'json' in self.headers.get('Content-Type', 'application/json'):
+            return json.loads(content.decode('utf-8')) if content else None
+        return content
+
+    def send(self, status: int, body=None, content_type: str='application/json'):
+        if body is None:
+            content = b''
+        elif isinstance(body, bytes):
+            content = body
+        else:
+            content = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def dispatch(self, method: str):
+        server = self.server.stub
+        server.delay()
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+        query = parse_qs(url.query)
+        try:
+            body = self.read_body()
+        except ValueError:
+            return self.send(400, {'error': 'Malformed JSON'})
+        with server.lock:
+            server.request_count += 1
+            if path == '/api/v1/auth/session' and method == 'POST':
+                return self.send(200, server.authenticate(body or {}))
+            if self.headers.get('apiKey') != server.api_key:
+                return self.send(401, {'error': 'Not authorized'})
+            if path == '/api/v1/sessions':
+                if method == 'POST':
+                    session = server.new_session()
+                    return self.send(201, {'id': session.session_id, 'links': [
+                        {'href': f'/api/v1/sessions/{session.session_id}'}]})
+                return self.send(200, [
+                    {'id': session_id, 'state': 'ACTIVE'} for session_id in server.sessions])
+            match = StubRequestHandler.SESSION_PATTERN.match(path)
+            if match is None or int(match.group(1)) not in server.sessions:
+                return self.send(404, {'error': f'{path} is not found'})
+            session = server.sessions[int(match.group(1))]
+            if match.group(2) is None:
+                if method == 'DELETE':
+                    del server.sessions[session.session_id]
+                    return self.send(200, {})
+                return self.send(200, {'id': session.session_id, 'state': 'ACTIVE'})
+            try:
+                return self.handle_session(session, method, path, query, body)
+            except (KeyError, IndexError, TypeError) as error:
+                return self.send(400, {'error': f'{type(error).__name__}: {error}'})
+
+    def handle_session(self, session, method, path, query, body):
+        if path == f'{session.root}/files':
+            filename = query['filename'][0]
+            if 'absolute' in query:
+                filename = f'{query["absolute"][0]}/{filename}'
+            if method == 'GET':
+                if filename not in session.files:
+                    return self.send(404, {'error': f'{filename} is not found'})
+                return self.send(200, session.files[filename], 'application/octet-stream')
+            session.files[filename] = body if isinstance(body, bytes) else json.dumps(body).encode()
+            return self.send(201, {'links': [{'href': f'{session.root}/files/{filename}'}]})
+        if '/operations/' in path:
+            href, name = path.split('/operations/')
+            if name == 'select':
+                return self.send(200, {'result': [
+                    session.select(query) for query in body['selects']]})
+            state, result = session.operation(href, name, body)
+            return self.send(200 if state == 'SUCCESS' else 500, {
+                'id': '',
+                'url': f'{path}/1',
+                'state': state,
+                'result': result,
+                'progress': 100})
+        parent, object_type = session.parent_of(path)
+        if method == 'GET':
+            if path in session.objects:
+                return self.send(200, session.to_json(path))
+            if parent in session.objects:
+                return self.send(200, [
+                    session.to_json(href)
+                    for href in session.children[parent].get(path.split('/')[-1], [])])
+            return self.send(404, {'error': f'{path} is not found'})
+        if method == 'DELETE':
+            session.delete(path)
+            return self.send(200, {})
+        if method == 'PATCH':
+            if '/multivalue/' not in parent:
+                session.create(path, {}, singleton=not path.split('/')[-1].isdigit())
+            self.set_pattern(session, path, body)
+            return self.send(200, {})
+        # POST into collection
+        if path.split('/')[-1] in ('singleValue', 'counter', 'valueList'):
+            self.set_pattern(session, path, body)
+            return self.send(200, {})
+        if path not in session.objects and path.split('/')[-1] in ('frameRate', 'frameSize'):
+            session.create(path, {}, singleton=True)
+        if path in session.objects:
+            # POST to an object (e.g. singleton) only updates it
+            session.objects[path].update(body[0] if isinstance(body, list) else body or {})
+            return self.send(200, {})
+        payloads = body if isinstance(body, list) else [body or {}]
+        object_type = path.split('/')[-1]
+        if parent not in session.objects:
+            return self.send(404, {'error': f'{parent} is not found'})
+        hrefs = [session.add_child(parent, object_type, payload) for payload in payloads]
+        return self.send(201, {'links': [
+            {'rel': 'child', 'method': 'GET', 'href': href} for href in hrefs]})
+
+    @staticmethod
+    def set_pattern(session, path: str, body):
+        '''
+        The method stores multivalue pattern (singleValue, counter, ...)
+        '''
+        parent, pattern = session.parent_of(path)
+        if parent in session.objects and '/multivalue/' in parent:
+            value = body[0] if isinstance(body, list) else body
+            session.objects[parent].update(pattern=pattern, **{pattern: value})
+        elif path in session.objects:
+            session.objects[path].update(body[0] if isinstance(body, list) else body or {})
+
+
+class IxNetworkStubServer():
+    '''
+    This is a concrete class of local stand-in for IxNetwork REST API
+    server, intended for offline testing and benchmarking of
+    IxNetworkRESTAPI. It supports authentication, sessions, vport,
+    topology, deviceGroup, ethernet, ipv4, multivalues, traffic items,
+    /operations/select with synthetic statistics views, files and the
+    most common operations.
+
+    Server uses HTTPS with self-signed certificate for
+    'ixnetwork-self-host' (generated with openssl unless provided).
+    Each request is delayed by "latency" seconds (plus random "jitter").
+    Running traffic is emulated with "frame_rate" frames per second per
+    flow and "loss" ratio of lost frames.
+    '''
+
+    HOSTNAME = 'ixnetwork-self-host'
+
+    def __init__(
+            self,
+            host: str='127.0.0.1',
+            port: int=0,
+            latency: float=0.0,
+            jitter: float=0.0,
+            frame_rate: float=1000000.0,
+            loss: float=0.0,
+            certificate: str=None,
+            key: str=None,
+            use_ssl: bool=True):
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.lock = threading.RLock()
+        self.api_key = 'stub-api-key'
+        self.frame_rate = frame_rate
+        self.loss = loss
+        self.sessions = {1: StubSession(1, frame_rate, loss)}
+        self.request_count = 0
+        self.httpd = ThreadingHTTPServer((host, port), StubRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        # Temporary directory with generated certificate and key
+        self.certificate_directory = None
+        if use_ssl:
+            if certificate is None:
+                certificate, key = self.generate_certificate()
+                self.certificate_directory = os.path.dirname(certificate)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certificate, key)
+            self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True)
+        self.thread = None
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    @staticmethod
+    def generate_certificate():
+        '''
+        The method generates self-signed certificate like the default
+        IxNetwork one and returns paths of certificate and key files
+        '''
+        directory = tempfile.mkdtemp(prefix='ixnetwork-stub-')
+        certificate = os.path.join(directory, 'cert.pem')
+        key = os.path.join(directory, 'key.pem')
+        subprocess.run(
+            [
+                'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+                '-keyout', key, '-out', certificate, '-days', '365',
+                '-subj', f'/CN={IxNetworkStubServer.HOSTNAME}',
+                '-addext', f'subjectAltName=DNS:{IxNetworkStubServer.HOSTNAME}'],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return certificate, key
+
+    def delay(self):
+        if self.latency or self.jitter:
+            sleep(self.latency + random.uniform(0, self.jitter))
+
+    def authenticate(self, credentials: dict) -> dict:
+        return {
+            'apiKey': self.api_key,
+            'username': credentials.get('username', 'admin'),
+            'sessionId': 1,
+            'userAccountUrl': '/api/v1/auth/session'}
+
+    def new_session(self):
+        session_id = max(self.sessions, default=0) + 1
+        self.sessions[session_id] = StubSession(session_id, self.frame_rate, self.loss)
+        return self.sessions[session_id]
+
+    def start(self):
+        '''
+        The method starts server in the background thread
+        '''
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+        if self.certificate_directory is not None:
+            shutil.rmtree(self.certificate_directory, ignore_errors=True)
+            self.certificate_directory = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local IxNetwork REST API stub server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11009)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra seconds')
+    arguments = parser.parse_args()
+    server = IxNetworkStubServer(
+        arguments.host, arguments.port, arguments.latency, arguments.jitter)
+    print(f'IxNetwork stub is listening on https://{arguments.host}:{server.port}')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
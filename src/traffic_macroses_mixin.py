@@ -1,10 +1,15 @@
 import json
-from time import sleep
-
+from urllib.parse import urlencode
+from src.select_query import SelectQuery
+from src.select_query_mixin import SelectQueryMixin
 from src.traffic_operations_mixin import TrafficOperationsMixin
+from src.instrumentation import traced
+from src.statistics_poller import StatisticsPoller
+from src.statistics_table import StatisticsTable
+from src.service_operations_mixin import stream_to_file
 
 
-class TrafficMacrosesMixin(TrafficOperationsMixin):
+class TrafficMacrosesMixin(TrafficOperationsMixin, SelectQueryMixin):
     '''
     This is a mixin class. It only contains specific methods
     and can't be instantiate (due to inheritance from ABC class).
@@ -12,94 +17,216 @@ class TrafficMacrosesMixin(TrafficOperationsMixin):
     This class contains macroses for simplify traffic items creation
     '''
 
-    def traffic_item_macros(self, duration=60):
+    # Directory on the IxNetwork host for CSV snapshots of statistics views
+    CSV_SNAPSHOT_LOCATION: str = 'C:/Results'
+    # Settings of the server side CSV snapshot of statistics views
+    CSV_SNAPSHOT_SETTINGS: list = [
+        'Snapshot.View.Contents: allPages',
+        f'Snapshot.View.Csv.Location: {CSV_SNAPSHOT_LOCATION}',
+        'Snapshot.View.Csv.GeneratingMode: kOverwriteCSVFile']
+    # Size of chunks for streaming download of CSV snapshots
+    CSV_CHUNK_SIZE: int = 1024 * 1024
+
+    @traced
+    def traffic_item_macros(
+            self,
+            duration=60,
+            interval: float=None,
+            until=None,
+            sinks=()):
         '''
         The method combines several traffic items operations to perform
-        traffic item creation, starting, waiting traffic duration time,
-        gathering statistics and finally stopping traffic stream.
+        traffic item creation, starting, polling flow statistics during
+        traffic duration time and finally stopping traffic stream.
+
+        Statistics are polled every "interval" seconds (at the start and
+        at the end of duration by default) and each sample is passed to "sinks",
+        traffic is stopped earlier if "until" predicate returns True for
+        a sample (see StatisticsPoller). The method returns the last sample.
         '''
         self.generate_traffic_item()
         self.apply_traffic_item()
         self.start_all_traffic_items()
-        sleep(duration)
-        handy_statistics, formatted_statistics = self.gathering_flow_statistics()
-        self.stop_all_traffic_items()
-        return handy_statistics, formatted_statistics
+        try:
+            for sample in StatisticsPoller(
+                    self, interval or duration or 1, duration, until, sinks):
+                pass
+        finally:
+            self.stop_all_traffic_items()
+        handy_statistics = sample.statistics
+        return handy_statistics, format_flow_statistics(handy_statistics)
 
+    @traced
     def gathering_flow_statistics(self):
         '''
         The method gets view ID from /statistics node and the gathering
         flow statistics data from this view.
         '''
-        select_dict_json = json.dumps(
+        handy_statistics = self.flow_statistics()
+        return handy_statistics, format_flow_statistics(handy_statistics)
+
+    def flow_statistics_view_id(self):
+        '''
+        The method returns id of the flow statistics view
+        '''
+        return self.statistics_view_id('Flow Statistics')
+
+    def statistics_view_id(self, caption: str):
+        '''
+        The method returns id of the statistics view with provided caption
+        (like 'Port Statistics' or 'Traffic Item Statistics'). Ids of all
+        views are fetched by one select and cached until new config or
+        traffic apply.
+        '''
+        if caption not in self.view_ids:
+            # Get statistics views IDs
+            statistics, = self.select(
+                SelectQuery('/statistics').child('view', ['caption', 'id']))
+            self.view_ids.update({
+                view['caption']: view['id']
+                for view in statistics.children('view')})
+        if caption not in self.view_ids:
+            raise LookupError(f'"{caption}" statistics view is not found')
+        return self.view_ids[caption]
+
+    def statistics_view_rows(self, view_id, page_size: int=None):
+        '''
+        The method is a generator, that walks all pages of the statistics
+        view and yields column captions first and then rows (lists of
+        strings) page by page. View is returned to the first page at the end.
+        '''
+        data_href = f'{self.api_root}/statistics/view/{view_id}/data'
+        page = {'currentPage': 1}
+        if page_size is not None:
+            page['pageSize'] = page_size
+        current_page = total_pages = 1
+        try:
+            while current_page <= total_pages:
+                page['currentPage'] = current_page
+                response = self.session.patch(
+                    url=''.join([self.entry_point, data_href]),
+                    data=json.dumps(page))
+                self.logger(response)
+                data = self.statistics_view_page(data_href)
+                if current_page == 1:
+                    yield data['columnCaptions']
+                    total_pages = int(data.get('totalPages') or 1)
+                for row in data['pageValues']:
+                    yield row[0]
+                current_page += 1
+        finally:
+            if total_pages > 1:
+                response = self.session.patch(
+                    url=''.join([self.entry_point, data_href]),
+                    data=json.dumps({'currentPage': 1}))
+                self.logger(response)
+
+    def statistics_view_page(self, data_href: str, timeout: float=30):
+        '''
+        The method returns current page of the view data, when it is ready
+        '''
+        for _ in range(int(timeout / 0.5) + 1):
+            data, = self.select(SelectQuery(data_href, [
+                'columnCaptions', 'pageValues', 'totalPages', 'isReady']))
+            if data.get('isReady', True):
+                return data
+            self.pause(0.5)
+        raise TimeoutError(f'Statistics of {data_href} are not ready')
+
+    @traced
+    def statistics_table(
+            self,
+            caption: str='Flow Statistics',
+            page_size: int=500) -> StatisticsTable:
+        '''
+        The method returns all rows of the statistics view (all pages)
+        as columnar StatisticsTable with parsed numeric columns
+        '''
+        rows = self.statistics_view_rows(
+            self.statistics_view_id(caption), page_size)
+        return StatisticsTable(next(rows)).extend(rows)
+
+    @traced
+    def download_view_csv(
+            self,
+            caption: str='Flow Statistics',
+            path: str=None,
+            compression: str=None,
+            chunk_size: int=None) -> str:
+        '''
+        The method takes server side CSV snapshot of all pages of the
+        statistics view into CSV_SNAPSHOT_LOCATION directory of the
+        IxNetwork host and streams it to the "path" ("<caption>.csv" by
+        default) by chunks, optionally compressed ('gzip' or 'zstd'), like
+        save_and_download_config(). It is a bulk alternative to
+        statistics_table() for views with very many rows. The method
+        returns SHA-256 hex digest of the (uncompressed) CSV.
+        '''
+        filename = f'{caption}.csv'
+        snapshot_dict_json = json.dumps(
             {
-                "selects": [
-                    {
-                        "from": "/statistics",
-                        "properties": [],
-                        "children": [
-                            {
-                                "child": "view",
-                                "properties": [
-                                    "*"
-                                ],
-                                "filters": []
-                            }
-                        ],
-                        "inlines": []
-                    }
-                ]
+                'arg1': [caption],
+                'arg2': TrafficMacrosesMixin.CSV_SNAPSHOT_SETTINGS
             })
-        # Get statistics views IDs
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/operations/select']),
-            data=select_dict_json)
-        view_ids = self.response.json()['result'][0]['view']
-        # Finding flow statistics view id
-        for view in view_ids:
-            if view['csvFileName'] == 'Flow Statistics.csv':
-                flow_statistics_view_id = view['id']
-                break
+                self.api_root, '/statistics/operations/takeviewcsvsnapshot']),
+            data=snapshot_dict_json)
+        self.logger(response)
+        self.wait_for_operation(response)
+        # Get CSV from IxNetwork, snapshot is written to the provided location
+        file_query = urlencode({
+            'absolute': TrafficMacrosesMixin.CSV_SNAPSHOT_LOCATION,
+            'filename': filename})
+        with self.session.get(
+                url=''.join([
+                    self.entry_point,
+                    self.api_root, f'/files?{file_query}']),
+                stream=True) as response:
+            self.logger(response, content=False)
+            response.raise_for_status()
+            return stream_to_file(
+                response, path or filename, compression,
+                chunk_size or TrafficMacrosesMixin.CSV_CHUNK_SIZE)
+
+    def flow_statistics(self, view_id=None) -> dict:
+        '''
+        The method returns flow statistics of both traffic directions
+        {'straight_direction': {column: value}, 'backward_direction': ...}
+        by one select request (if view id is provided)
+        '''
+        if view_id is None:
+            view_id = self.flow_statistics_view_id()
         # Get data from founded view
-        select_dict_json = json.dumps(
-            {
-                "selects": [
-                    {
-                        "from": f"/statistics/view/{flow_statistics_view_id}/data",
-                        "properties": [
-                            "pageValues",
-                            "columnCaptions",
-                        ],
-                        "children": [],
-                        "inlines": []
-                    }
-                ]
-            })
-        self.response = self.session.post(
-            url=''.join([
-                self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/operations/select']),
-            data=select_dict_json)
-        flow_statistics_row_data = self.response.json()['result'][0]
-        flow_statistics_row_data.pop('href')
-        # Construct two statistics: handy dictionary and pretty formatted str
-        handy_statistics = {}
-        TITLE = 'FLOW STATISTICS'
-        formatted_statistics = f'{TITLE:^130}'
-        directions = ['Straight direction', 'Backward direction']
-        formatted_statistics += f'\n\n{directions[0]:<65} {directions[1]:<65}\n'
+        flow_statistics_row_data, = self.select(
+            SelectQuery(
+                f'/statistics/view/{view_id}/data',
+                ['pageValues', 'columnCaptions']))
         # Sub-dictionaries for both traffic direction
-        handy_statistics['straight_direction'] = {}
-        handy_statistics['backward_direction'] = {}
-        for index, key in enumerate(flow_statistics_row_data['columnCaptions']):
-            handy_statistics['straight_direction'][key] = flow_statistics_row_data[
-                'pageValues'][0][0][index]
-            handy_statistics['backward_direction'][key] = flow_statistics_row_data[
-                'pageValues'][1][0][index]
-            # Pretty formatting output
-            formatted_statistics += ''.join([
-                f'\n{key:<40} {flow_statistics_row_data["pageValues"][0][0][index]:<25}',
-                f' {key:<40} {flow_statistics_row_data["pageValues"][1][0][index]:<25}'])
-        return handy_statistics, formatted_statistics
+        handy_statistics = {}
+        for direction, row in zip(
+                ['straight_direction', 'backward_direction'],
+                flow_statistics_row_data['pageValues']):
+            handy_statistics[direction] = dict(zip(
+                flow_statistics_row_data['columnCaptions'], row[0]))
+        return handy_statistics
+
+
+def format_flow_statistics(handy_statistics: dict) -> str:
+    '''
+    The function returns pretty formatted flow statistics of both
+    traffic directions
+    '''
+    TITLE = 'FLOW STATISTICS'
+    formatted_statistics = f'{TITLE:^130}'
+    directions = ['Straight direction', 'Backward direction']
+    formatted_statistics += f'\n\n{directions[0]:<65} {directions[1]:<65}\n'
+    straight = handy_statistics.get('straight_direction', {})
+    backward = handy_statistics.get('backward_direction', {})
+    for key in straight:
+        # Pretty formatting output
+        formatted_statistics += ''.join([
+            f'\n{key:<40} {straight[key]:<25}',
+            f' {key:<40} {backward.get(key, ""):<25}'])
+    return formatted_statistics
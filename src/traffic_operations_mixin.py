@@ -1,8 +1,10 @@
 import json
-from src.session_abc import IxNetworkSession
+from src.select_query import SelectQuery
+from src.select_query_mixin import SelectQueryMixin
+from src.instrumentation import traced
 
 
-class TrafficOperationsMixin(IxNetworkSession):
+class TrafficOperationsMixin(SelectQueryMixin):
     '''
     This is a mixin class. It only contains specific methods
     and can't be instantiate (due to inheritance from ABC class).
@@ -11,6 +13,7 @@ class TrafficOperationsMixin(IxNetworkSession):
     their properties.
     '''
 
+    @traced
     def create_traffic_item(
             self,
             hrefs,
@@ -18,156 +21,165 @@ class TrafficOperationsMixin(IxNetworkSession):
             trafficType='ipv4',
             frame_parameters={
                 'rate': 100, 'type': 'percentLineRate', 'fixedSize': 1500},
-            flow_groups=['ipv4SourceIp0', 'ipv4DestIp0']):
+            flow_groups=['ipv4SourceIp0', 'ipv4DestIp0'],
+            storage=None):
         '''
         The method creates traffic item with appropriate settings:
          * 100% line rate
          * frame size is 1500 bytes
          * bidirectional IPv4 (by default) traffic
+        and returns its href (it is also saved to the storage, if provided).
+        For many traffic items use create_traffic_items().
         '''
+        payloads = traffic_item_payloads(
+            hrefs, name, trafficType, frame_parameters, flow_groups)
         # Create traffic item with basic settings
-        traffic_properties_dict_json = json.dumps([
-            {
-                "biDirectional": True,
-                "enabled": True,
-                "name": name,
-                "routeMesh": "fullMesh",
-                "trafficType": trafficType
-            }])
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/trafficItem']),
-            data=traffic_properties_dict_json)
-        self.logger()
+                self.api_root, '/traffic/trafficItem']),
+            data=json.dumps([payloads.pop('')]))
+        self.logger(response)
+        traffic_item_href = response.json()['links'][0]['href']
         # Set source and destinations (it uses provided hrefs).
-        # You should provide here two hrefs, left side and right side.
-        # At least for now it is hardcoded.
-        end_points_dict_json = json.dumps([
-            {
-                "destinations": [
-                    hrefs[0]
-                ],
-                "sources": [
-                    hrefs[1]
-                ]
-            }])
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/trafficItem/1/endpointSet']),
-            data=end_points_dict_json)
-        self.logger()
-        # Set frame parameters
-        frame_rate_dict_json = json.dumps(
-            {
-                "rate": frame_parameters['rate'],
-                "type": frame_parameters['type']
-            })
-        self.response = self.session.patch(
-            url=''.join([
-                self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/trafficItem/1/configElement/1/frameRate']),
-            data=frame_rate_dict_json)
-        self.logger()
-        frame_size_dict_json = json.dumps(
-            {
-                "fixedSize": frame_parameters['fixedSize'],
-            })
-        self.response = self.session.patch(
-            url=''.join([
-                self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/trafficItem/1/configElement/1/frameSize']),
-            data=frame_size_dict_json)
-        self.logger()
-        # Set Flow groups
-        flow_groups_dict_json = json.dumps(
-            {
-                "distributions": flow_groups,
-            })
-        self.response = self.session.patch(
-            url=''.join([
-                self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/trafficItem/1/configElement/1/transmissionDistribution']),
-            data=flow_groups_dict_json)
-        self.logger()
-        # Set tracking
-        tracking_dict_json = json.dumps(
-            {
-                "trackBy": [
-                    "ethernetIiSourceaddress0",
-                    "ethernetIiDestinationaddress0"]
-            })
-        self.response = self.session.patch(
-            url=''.join([
-                self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/trafficItem/1/tracking']),
-            data=tracking_dict_json)
-        self.logger()
+                traffic_item_href, '/endpointSet']),
+            data=json.dumps([payloads.pop('/endpointSet/1')]))
+        self.logger(response)
+        # Set frame parameters, flow groups and tracking
+        for path, payload in payloads.items():
+            response = self.session.patch(
+                url=''.join([self.entry_point, traffic_item_href, path]),
+                data=json.dumps(payload))
+            self.logger(response)
+        if storage is not None:
+            storage.add(traffic_item_href)
+        return traffic_item_href
+
+    def traffic_item_hrefs(self) -> list:
+        '''
+        The method returns hrefs of all traffic items of the config
+        '''
+        traffic, = self.select(
+            SelectQuery(f'{self.api_root}/traffic').child('trafficItem', ['name']))
+        return [item['href'] for item in traffic.children('trafficItem')]
 
+    @traced
     def start_all_traffic_items(self):
         '''
         The method starts all traffic items in the active IxNetwork scenario
         '''
-        # Hardcoded only one session
         operations_dict_json = json.dumps(
             {
-                "arg1": "/api/v1/sessions/1/ixnetwork/traffic"
+                "arg1": f"{self.api_root}/traffic"
             })
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/operations/start']),
+                self.api_root, '/traffic/operations/start']),
             data=operations_dict_json)
-        self.logger()
+        self.logger(response)
 
+    @traced
     def stop_all_traffic_items(self):
         '''
         The method stops all traffic items in the active IxNetwork scenario
         '''
-        # Hardcoded only one session
         operations_dict_json = json.dumps(
             {
-                "arg1": "/api/v1/sessions/1/ixnetwork/traffic"
+                "arg1": f"{self.api_root}/traffic"
             })
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/operations/stop']),
+                self.api_root, '/traffic/operations/stop']),
             data=operations_dict_json)
-        self.logger()
+        self.logger(response)
 
-    def generate_traffic_item(self):
+    @traced
+    def generate_traffic_item(self, hrefs: list=None):
         '''
         The method generates traffic items i.e. it triggers update procedure
         so that traffic item fields gets fresh data from topologies.
+        All provided traffic items (all items of the config by default) are
+        generated by one operation.
         '''
-        # Hardcoded only one traffic item
+        if hrefs is None:
+            hrefs = self.traffic_item_hrefs()
         operations_dict_json = json.dumps(
             {
-                "arg1": [
-                    "/api/v1/sessions/1/ixnetwork/traffic/trafficItem/1"]
+                "arg1": list(hrefs)
             })
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/trafficItem/operations/generate']),
+                self.api_root, '/traffic/trafficItem/operations/generate']),
             data=operations_dict_json)
-        self.logger()
+        self.logger(response)
 
+    @traced
     def apply_traffic_item(self):
         '''
         The method applies traffic item settings.
         After this procedure in can be started.
         '''
-        # Hardcoded only one traffic item
         operations_dict_json = json.dumps(
             {
-                "arg1": "/api/v1/sessions/1/ixnetwork/traffic"
+                "arg1": f"{self.api_root}/traffic"
             })
-        self.response = self.session.post(
+        response = self.session.post(
             url=''.join([
                 self.entry_point,
-                '/api/v1/sessions/1/ixnetwork/traffic/operations/apply']),
+                self.api_root, '/traffic/operations/apply']),
             data=operations_dict_json)
-        self.logger()
+        self.logger(response)
+        self.invalidate_view_ids()
+
+
+def traffic_item_payloads(
+        hrefs,
+        name: str='Test',
+        trafficType: str='ipv4',
+        frame_parameters: dict=None,
+        flow_groups: list=None) -> dict:
+    '''
+    The function returns payloads of traffic item and its children
+    {object path relative to traffic item: payload}. Root payload has
+    empty path. Destination is the first of provided hrefs, source
+    is the second one.
+    '''
+    frame_parameters = frame_parameters or {
+        'rate': 100, 'type': 'percentLineRate', 'fixedSize': 1500}
+    return {
+        '': {
+            "biDirectional": True,
+            "enabled": True,
+            "name": name,
+            "routeMesh": "fullMesh",
+            "trafficType": trafficType
+        },
+        '/endpointSet/1': {
+            "destinations": [
+                hrefs[0]
+            ],
+            "sources": [
+                hrefs[1]
+            ]
+        },
+        '/configElement/1/frameRate': {
+            "rate": frame_parameters['rate'],
+            "type": frame_parameters['type']
+        },
+        '/configElement/1/frameSize': {
+            "fixedSize": frame_parameters['fixedSize'],
+        },
+        '/configElement/1/transmissionDistribution': {
+            "distributions": flow_groups or ['ipv4SourceIp0', 'ipv4DestIp0'],
+        },
+        '/tracking': {
+            "trackBy": [
+                "ethernetIiSourceaddress0",
+                "ethernetIiDestinationaddress0"]
+        }}
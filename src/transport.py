@@ -0,0 +1,257 @@
+import os
+import json
+import base64
+import hashlib
+import tempfile
+import threading
+from time import perf_counter
+from collections import deque
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+# Connections to the IxNetwork host are pinned to its certificate
+from src.certificate_cache import PinnedAdapter
+
+
+class Cassette():
+    '''
+    This is a concrete class for the file with recorded HTTP exchanges.
+
+    Cassette is a JSON lines file, one exchange per line:
+        {"method": "GET", "url": "/api/v1/...", "request": body,
+         "status": 200, "reason": "OK", "headers": {...},
+         "response": body, "elapsed": 0.012}
+    Small bodies are stored inline ({"text": ...} or {"base64": ...}),
+    bodies larger than blob_threshold bytes are stored out-of-line in
+    the "<path>.blobs" directory as files named by their SHA-256 digest
+    ({"blob": digest, "size": size}).
+    '''
+
+    # Size of chunks for copying of streamed bodies
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, path: str, blob_threshold: int=64 * 1024):
+        self.path = path
+        self.blob_directory = f'{path}.blobs'
+        self.blob_threshold = blob_threshold
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_directory, digest)
+
+    def encode_body(self, body) -> dict:
+        '''
+        The method returns cassette entry for the request or response body
+        '''
+        if body is None:
+            return None
+        if not isinstance(body, (str, bytes)):
+            # Streamed request body (e.g. file upload) can't be read twice
+            return {'stream': True}
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        if len(body) <= self.blob_threshold:
+            try:
+                return {'text': body.decode('utf-8')}
+            except UnicodeDecodeError:
+                return {'base64': base64.b64encode(body).decode('ascii')}
+        digest = hashlib.sha256(body).hexdigest()
+        os.makedirs(self.blob_directory, exist_ok=True)
+        if not os.path.exists(self.blob_path(digest)):
+            with open(self.blob_path(digest), 'wb') as blob_file:
+                blob_file.write(body)
+        return {'blob': digest, 'size': len(body)}
+
+    def write_blob(self, chunks) -> dict:
+        '''
+        The method stores body from iterable of chunks out-of-line
+        without reading it into memory and returns its cassette entry
+        '''
+        os.makedirs(self.blob_directory, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=self.blob_directory, delete=False) as blob_file:
+            for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                blob_file.write(chunk)
+        os.replace(blob_file.name, self.blob_path(digest.hexdigest()))
+        return {'blob': digest.hexdigest(), 'size': size}
+
+    def decode_body(self, entry: dict) -> bytes:
+        '''
+        The method returns body for the cassette entry
+        '''
+        if not entry or entry.get('stream'):
+            return b''
+        if 'text' in entry:
+            return entry['text'].encode('utf-8')
+        if 'base64' in entry:
+            return base64.b64decode(entry['base64'])
+        with open(self.blob_path(entry['blob']), 'rb') as blob_file:
+            return blob_file.read()
+
+    def records(self):
+        '''
+        The method yields exchanges from the cassette one by one
+        '''
+        with open(self.path, 'r', encoding='utf-8') as cassette_file:
+            for line in cassette_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def request_key(method: str, url: str) -> tuple:
+    '''
+    The function returns key for matching requests during replay: method and
+    url without scheme and host, so the replayed session can use any host
+    '''
+    parts = urlsplit(url)
+    path = parts.path if not parts.query else '?'.join([parts.path, parts.query])
+    return method.upper(), path
+
+
+def redact_api_key(content: bytes) -> bytes:
+    '''
+    The function returns authentication response body with redacted api
+    key and username, other fields are kept (non-JSON body is dropped)
+    '''
+    try:
+        entry = json.loads(content)
+    except ValueError:
+        return b''
+    if isinstance(entry, dict):
+        for name in ('apiKey', 'username'):
+            if name in entry:
+                entry[name] = RecordingAdapter.REDACTED
+    return json.dumps(entry).encode('utf-8')
+
+
+class RecordingAdapter(PinnedAdapter):
+    '''
+    This is a transport adapter, that sends requests to the IxNetwork host
+    as ordinary PinnedAdapter and streams every exchange to the cassette
+    (see Cassette), one line right after the response is received.
+
+    Streamed responses (e.g. config download) are copied to the blob by
+    chunks, so they are never read into memory.
+
+    Credentials are never written: request body of the authentication
+    is dropped, api key and username in its response are replaced by
+    REDACTED, so cassettes of production runs can be shared.
+    '''
+
+    offline = False
+    AUTH_URL = '/api/v1/auth/session'
+    REDACTED = 'redacted'
+
+    def __init__(self, path: str, blob_threshold: int=64 * 1024, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = Cassette(path, blob_threshold)
+        self._lock = threading.Lock()
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def send(self, request, stream=False, **kwargs):
+        started = perf_counter()
+        response = super().send(request, stream=stream, **kwargs)
+        url = request_key(request.method, request.url)[1]
+        # Credentials are never written
+        request_body = None if url == RecordingAdapter.AUTH_URL else request.body
+        chunks = response.raw.stream(Cassette.CHUNK_SIZE, decode_content=True)
+        if stream:
+            body = self.cassette.write_blob(chunks)
+            response.raw.release_conn()
+            # Streamed content is read back from the blob
+            response.raw = open(self.cassette.blob_path(body['blob']), 'rb')
+        else:
+            response._content = b''.join(chunks)
+            response._content_consumed = True
+            response.raw.release_conn()
+            if url == RecordingAdapter.AUTH_URL:
+                body = self.cassette.encode_body(redact_api_key(response._content))
+            else:
+                body = self.cassette.encode_body(response._content)
+        record = {
+            'method': request.method,
+            'url': url,
+            'request': self.cassette.encode_body(request_body),
+            'status': response.status_code,
+            'reason': response.reason,
+            # Content is stored already decoded
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in ('content-encoding', 'transfer-encoding')},
+            'response': body,
+            # Time till the whole body is received
+            'elapsed': perf_counter() - started}
+        with self._lock:
+            self._file.write(json.dumps(record, separators=(',', ':')))
+            self._file.write('\n')
+            self._file.flush()
+        return response
+
+    def close(self):
+        super().close()
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    '''
+    This is a transport adapter, that answers requests from the cassette
+    recorded by RecordingAdapter without any network interaction.
+
+    Requests are matched by method and url (without host) in the recorded
+    order. If recorded responses for GET request are over, the last one is
+    repeated (e.g. for additional polling); any other unmatched request
+    raises requests.exceptions.ConnectionError.
+
+    Replay doesn't need IxNetwork host, so IxNetworkRESTAPI skips
+    certificate and hostname preparation and doesn't wait between polls.
+    '''
+
+    offline = True
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.cassette = Cassette(path)
+        self._lock = threading.Lock()
+        # {(method, url): deque of records}
+        self._records = {}
+        for record in self.cassette.records():
+            self._records.setdefault(
+                request_key(record['method'], record['url']), deque()).append(record)
+
+    def next_record(self, request) -> dict:
+        key = request_key(request.method, request.url)
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                raise requests.exceptions.ConnectionError(
+                    f'There is no recorded response for {request.method} {request.url}',
+                    request=request)
+            if len(records) == 1 and key[0] == 'GET':
+                return records[0]
+            return records.popleft()
+
+    def send(self, request, stream=False, **kwargs):
+        record = self.next_record(request)
+        response = requests.Response()
+        response.status_code = record['status']
+        response.reason = record['reason']
+        response.headers = CaseInsensitiveDict(record['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        entry = record['response']
+        if stream and entry and 'blob' in entry:
+            response.raw = open(self.cassette.blob_path(entry['blob']), 'rb')
+        else:
+            response._content = self.cassette.decode_body(entry)
+            response._content_consumed = True
+        return response
+
+    def close(self):
+        pass